@@ -85,6 +85,18 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Use a shared backend (Redis, Memcached) in production: the local-memory
+# cache is per process, so workers would not see each other's invalidations.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -149,3 +161,25 @@ DJOSER = {
         "user_create": ["rest_framework.permissions.AllowAny"],
     }
 }
+
+# Idempotency-Key replay for POST /api/orders
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+IDEMPOTENCY_CACHE_SIZE = 1024
+
+# Seconds a user's group set stays cached (invalidated on group changes)
+ROLE_CACHE_TIMEOUT = 60 * 5
+
+# Seconds a /api/categories?with_stats= page stays cached (keyed by catalog version)
+CATEGORY_STATS_CACHE_TIMEOUT = 60 * 10
+
+# Seconds each worker keeps /api/menu-items/featured in memory
+FEATURED_CACHE_TTL = 60
+
+# Seconds a user's cart summary stays cached (invalidated on cart writes)
+CART_SUMMARY_CACHE_TIMEOUT = 60 * 15
+
+# Seconds since a cart was last changed before cleanup_carts removes it
+ABANDONED_CART_AGE = 60 * 60 * 24 * 7
+
+# Pre-rendered menu shared by all workers on a host through mmap
+MENU_SNAPSHOT_PATH = BASE_DIR / 'menu_snapshot.bin'
@@ -0,0 +1,55 @@
+import heapq
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Order
+from .roles import DELIVERY
+
+BATCH_SIZE = 500
+
+
+def assign_pending_orders(batch_size=BATCH_SIZE):
+    """
+    Spreads unassigned open orders over the delivery group.
+
+    Every driver's current open-order count comes from one annotated query;
+    pending orders are then handed, oldest first, to whoever has the fewest
+    open orders. Assignments are written with one UPDATE per driver and batch,
+    guarded by delivery_crew IS NULL so a concurrent run or manual assignment
+    is never overwritten. Returns {driver id: orders assigned}.
+    """
+    with transaction.atomic():
+        drivers = (
+            User.objects
+            .filter(groups__name=DELIVERY, is_active=True)
+            .annotate(open_orders=Count('delivery_orders', filter=Q(delivery_orders__status=False)))
+            .values_list('open_orders', 'id')
+        )
+        heap = list(drivers)
+        if not heap:
+            return {}
+        heapq.heapify(heap)
+
+        pending = (
+            Order.objects
+            .filter(status=False, delivery_crew__isnull=True)
+            .order_by('date', 'id')
+            .values_list('id', flat=True)
+        )
+        planned = {}
+        for order_id in pending:
+            load, driver_id = heapq.heappop(heap)
+            planned.setdefault(driver_id, []).append(order_id)
+            heapq.heappush(heap, (load + 1, driver_id))
+
+        assigned = {}
+        for driver_id, order_ids in planned.items():
+            for start in range(0, len(order_ids), batch_size):
+                assigned[driver_id] = assigned.get(driver_id, 0) + (
+                    Order.objects
+                    .filter(id__in=order_ids[start:start + batch_size], delivery_crew__isnull=True)
+                    .update(delivery_crew_id=driver_id)
+                )
+    return assigned
@@ -0,0 +1,234 @@
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Cart, MenuItem
+
+SUMMARY_KEY = 'cart:summary:{user_id}'
+REPRICE_CHUNK_SIZE = 1000
+CLEANUP_BATCH_SIZE = 200
+
+
+def cart_summary(user):
+    """
+    {'items', 'quantity', 'total'} for the user's cart, from one aggregate()
+    query. Cached per user until the cart changes; every code path that
+    writes cart rows calls invalidate_summaries().
+    """
+    key = SUMMARY_KEY.format(user_id=user.pk)
+    summary = cache.get(key)
+    if summary is None:
+        totals = Cart.objects.filter(user=user).aggregate(
+            items=Count('id'),
+            quantity=Coalesce(Sum('quantity'), 0),
+            total=Coalesce(Sum('price'), Value(Decimal('0.00'))),
+        )
+        summary = {
+            'items': totals['items'],
+            'quantity': totals['quantity'],
+            'total': f"{totals['total']:.2f}",
+        }
+        cache.set(key, summary, settings.CART_SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_summaries(user_ids):
+    """
+    Drops cached summaries now and again on commit, so a summary computed
+    by a concurrent request from the old rows doesn't outlive the write.
+    """
+    keys = [SUMMARY_KEY.format(user_id=user_id) for user_id in set(user_ids)]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _merge(user, menuitem, quantity):
+    """One UPDATE adding `quantity` to an existing row; returns rows matched."""
+    return Cart.objects.filter(user=user, menuitem=menuitem).update(
+        quantity=F('quantity') + quantity,
+        price=(F('quantity') + quantity) * F('unit_price'),
+        updated=timezone.now(),
+    )
+
+
+def add_to_cart(user, menuitem, quantity):
+    """
+    Adds `quantity` of `menuitem` to the user's cart. Returns (row, created).
+
+    A repeat add increments the existing row with a single F() UPDATE, so
+    concurrent taps can't lose an increment. On a miss the row is inserted
+    at the current menu price; if a concurrent request inserted it first,
+    the unique (menuitem, user) constraint fails and the add is retried as
+    an UPDATE.
+    """
+    invalidate_summaries([user.pk])
+    if not _merge(user, menuitem, quantity):
+        try:
+            with transaction.atomic():
+                row = Cart.objects.create(
+                    user=user,
+                    menuitem=menuitem,
+                    quantity=quantity,
+                    unit_price=menuitem.price,
+                    price=menuitem.price * quantity,
+                )
+            return row, True
+        except IntegrityError:
+            _merge(user, menuitem, quantity)
+    return Cart.objects.get(user=user, menuitem=menuitem), False
+
+
+def _existing_menuitems(user, menuitem_ids):
+    return set(
+        Cart.objects.filter(user=user, menuitem_id__in=menuitem_ids).values_list('menuitem_id', flat=True)
+    )
+
+
+def _upsert_sql(row_count):
+    """
+    INSERT ... ON CONFLICT (menuitem, user) DO UPDATE that adds the new
+    quantity to the stored one and reprices at the row's own unit_price,
+    like _merge does. Django's bulk_create(update_conflicts=True) can only
+    overwrite columns with the inserted values, which would lose an add
+    committed by a concurrent request.
+    """
+    table = connection.ops.quote_name(Cart._meta.db_table)
+    columns = ['user_id', 'menuitem_id', 'quantity', 'unit_price', 'price', 'updated']
+    placeholders = ', '.join(['(%s)' % ', '.join(['%s'] * len(columns))] * row_count)
+    return (
+        f'INSERT INTO {table} ({", ".join(columns)}) VALUES {placeholders} '
+        f'ON CONFLICT (menuitem_id, user_id) DO UPDATE SET '
+        f'quantity = {table}.quantity + excluded.quantity, '
+        f'price = ({table}.quantity + excluded.quantity) * {table}.unit_price, '
+        f'updated = excluded.updated '
+        f'RETURNING id, user_id, menuitem_id, quantity, unit_price, price, updated'
+    )
+
+
+def add_many_to_cart(user, items):
+    """
+    Adds (menuitem, quantity) pairs to the user's cart. Returns (rows, created)
+    where `created` tells whether any new row was inserted.
+
+    Repeated items are summed first, then all rows are written with a single
+    INSERT ... ON CONFLICT DO UPDATE (see _upsert_sql), so a basket costs the
+    same three queries whatever its size. Rows already in the cart are
+    incremented in the database, as in add_to_cart, so concurrent adds
+    can't overwrite each other.
+    """
+    menuitems = {}
+    quantities = {}
+    for menuitem, quantity in items:
+        menuitems[menuitem.pk] = menuitem
+        quantities[menuitem.pk] = quantities.get(menuitem.pk, 0) + quantity
+
+    fields = {field.attname: field for field in Cart._meta.concrete_fields}
+    now = timezone.now()
+    params = []
+    for pk, quantity in quantities.items():
+        unit_price = menuitems[pk].price
+        values = {
+            'user_id': user.pk,
+            'menuitem_id': pk,
+            'quantity': quantity,
+            'unit_price': unit_price,
+            'price': unit_price * quantity,
+            'updated': now,
+        }
+        params += [fields[name].get_db_prep_save(value, connection) for name, value in values.items()]
+
+    invalidate_summaries([user.pk])
+    with transaction.atomic():
+        # only decides between 201 and 200; the upsert doesn't rely on it
+        existing = _existing_menuitems(user, quantities)
+        rows = list(Cart.objects.raw(_upsert_sql(len(quantities)), params))
+    return rows, len(existing) < len(rows)
+
+
+def reprice(queryset):
+    """
+    Moves the cart rows in `queryset` to their menu item's current price.
+
+    Rows already at that price are skipped; the rest are fixed by one
+    UPDATE whose new unit_price comes from a correlated subquery on
+    MenuItem, with price = quantity * unit_price. Returns the rows updated.
+    """
+    menu_price = Subquery(MenuItem.objects.filter(pk=OuterRef('menuitem_id')).values('price')[:1])
+    stale = queryset.exclude(unit_price=F('menuitem__price'))
+    with transaction.atomic():
+        user_ids = set(stale.values_list('user_id', flat=True))
+        if not user_ids:
+            return 0
+        updated = stale.update(unit_price=menu_price, price=F('quantity') * menu_price)
+        invalidate_summaries(user_ids)
+    return updated
+
+
+def reprice_menu_items(menuitem_ids):
+    """Reprices the carts holding any of `menuitem_ids` after a price change."""
+    menuitem_ids = list(menuitem_ids)
+    if not menuitem_ids:
+        return 0
+    return reprice(Cart.objects.filter(menuitem_id__in=menuitem_ids))
+
+
+def reprice_all_carts(chunk_size=REPRICE_CHUNK_SIZE):
+    """
+    Reprices every cart row, walking the table in primary key ranges of
+    `chunk_size` rows with one transaction each, so no lock is held for
+    the whole table. Returns the rows updated.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Cart.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            return updated
+        updated += reprice(Cart.objects.filter(pk__gte=ids[0], pk__lte=ids[-1]))
+        last_id = ids[-1]
+
+
+def abandoned_carts(cutoff):
+    """Cart rows of users who haven't touched any row of their cart since `cutoff`."""
+    active_users = Cart.objects.filter(updated__gte=cutoff).values('user_id')
+    return Cart.objects.filter(updated__lt=cutoff).exclude(user_id__in=active_users)
+
+
+def delete_abandoned_carts(cutoff, batch_size=CLEANUP_BATCH_SIZE, pause=0):
+    """
+    Deletes abandoned carts in primary key order, `batch_size` rows per
+    transaction, sleeping `pause` seconds in between so checkouts waiting
+    on the SQLite write lock get their turn. A cart touched after it was
+    picked is left alone entirely. Returns (rows deleted, batches).
+    """
+    deleted = 0
+    batches = 0
+    last_id = 0
+    while True:
+        rows = list(
+            abandoned_carts(cutoff)
+            .filter(pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', 'user_id')[:batch_size]
+        )
+        if not rows:
+            return deleted, batches
+        last_id = rows[-1][0]
+        with transaction.atomic():
+            # re-checks both conditions, so a cart touched since it was
+            # picked is kept whole
+            count, _ = abandoned_carts(cutoff).filter(pk__in=[pk for pk, _ in rows]).delete()
+            invalidate_summaries(user_id for _, user_id in rows)
+        deleted += count
+        batches += 1
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,36 @@
+import uuid
+
+from .models import CatalogVersion
+
+VERSION_ID = 1
+
+
+def catalog_version():
+    """
+    Returns a token that changes whenever a MenuItem or Category changes.
+
+    It is stored in the database rather than in a cache, so every worker
+    sees the same token, and a write becomes visible to other workers
+    together with the rows it changed. Reading it is one primary key lookup.
+    """
+    version = CatalogVersion.objects.filter(pk=VERSION_ID).values_list('version', flat=True).first()
+    if version is None:
+        row, _ = CatalogVersion.objects.get_or_create(
+            pk=VERSION_ID, defaults={'version': uuid.uuid4().hex}
+        )
+        version = row.version
+    return version
+
+
+def bump_catalog_version():
+    """
+    Invalidates everything keyed on catalog_version().
+
+    The new token is written in the caller's transaction: the writing
+    request sees it right away, other workers only once the changed rows
+    are committed, and a rollback takes it back with them. Derived data
+    such as the menu snapshot is rebuilt by the next read, not by the writer.
+    """
+    version = uuid.uuid4().hex
+    if not CatalogVersion.objects.filter(pk=VERSION_ID).update(version=version):
+        CatalogVersion.objects.get_or_create(pk=VERSION_ID, defaults={'version': version})
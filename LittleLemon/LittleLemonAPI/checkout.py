@@ -0,0 +1,65 @@
+import logging
+
+from django.db import transaction
+
+from .cart import invalidate_summaries
+from .models import Cart, Order, OrderItem
+from .reports import record_order_change, sales_snapshot
+from .utils import QueryCounter
+
+logger = logging.getLogger(__name__)
+
+
+class EmptyCartError(Exception):
+    pass
+
+
+class CheckoutResult:
+    def __init__(self, order, order_items, query_count):
+        self.order = order
+        self.order_items = order_items
+        self.query_count = query_count
+
+
+def checkout(user):
+    """
+    Turns the user's cart into an order in a single transaction.
+
+    The cart rows are locked and read once; the total is computed from that
+    snapshot, the order is inserted with its final total, the items are written
+    with one bulk INSERT, only the snapshotted cart rows are deleted and the
+    day's sales aggregate is updated.
+    Raises EmptyCartError when there is nothing to check out.
+    """
+    with QueryCounter() as counter, transaction.atomic():
+        cart = list(
+            Cart.objects.select_for_update()
+            .filter(user=user)
+            .only('id', 'menuitem_id', 'quantity', 'unit_price', 'price')
+        )
+        if not cart:
+            raise EmptyCartError
+
+        order = Order.objects.create(
+            user=user,
+            total=sum(item.price for item in cart)
+        )
+        order_items = OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                menuitem_id=item.menuitem_id,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+                price=item.price
+            )
+            for item in cart
+        ])
+        Cart.objects.filter(id__in=[item.id for item in cart]).delete()
+        invalidate_summaries([user.pk])
+        record_order_change(None, sales_snapshot(order))
+
+    logger.info(
+        'checkout order=%s items=%s queries=%s',
+        order.id, len(order_items), counter.count
+    )
+    return CheckoutResult(order, order_items, counter.count)
@@ -0,0 +1,79 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+CHUNK_SIZE = 500
+
+CSV_HEADER = [
+    'order_id', 'user', 'delivery_crew', 'status', 'total', 'date',
+    'menuitem', 'quantity', 'unit_price', 'price',
+]
+
+
+class _Echo:
+    """File-like object that hands csv.writer rows straight back."""
+
+    def write(self, value):
+        return value
+
+
+def iter_orders(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Yields orders with their items, `chunk_size` orders per query.
+
+    iterator() keeps only one chunk of orders in memory and runs the
+    order_items prefetch once per chunk.
+    """
+    return (
+        queryset
+        .order_by('id')
+        .prefetch_related('order_items')
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def stream_csv(queryset, chunk_size=CHUNK_SIZE):
+    """One CSV line per order item; orders without items get one line."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for order in iter_orders(queryset, chunk_size):
+        columns = [
+            order.id, order.user_id, order.delivery_crew_id or '',
+            int(order.status), order.total, order.date.isoformat(),
+        ]
+        items = order.order_items.all()
+        if not items:
+            yield writer.writerow(columns + [''] * 4)
+        for item in items:
+            yield writer.writerow(columns + [item.menuitem_id, item.quantity, item.unit_price, item.price])
+
+
+def stream_ndjson(queryset, chunk_size=CHUNK_SIZE):
+    """One JSON object per order, shaped like OrderSerializer output."""
+    for order in iter_orders(queryset, chunk_size):
+        yield json.dumps({
+            'id': order.id,
+            'user': order.user_id,
+            'delivery_crew': order.delivery_crew_id,
+            'status': order.status,
+            'total': str(order.total),
+            'date': order.date,
+            'order_items': [
+                {
+                    'id': item.id,
+                    'order': order.id,
+                    'menuitem': item.menuitem_id,
+                    'quantity': item.quantity,
+                    'unit_price': str(item.unit_price),
+                    'price': str(item.price),
+                }
+                for item in order.order_items.all()
+            ],
+        }, cls=DjangoJSONEncoder) + '\n'
+
+
+FORMATS = {
+    'csv': (stream_csv, 'text/csv', 'orders.csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson', 'orders.ndjson'),
+}
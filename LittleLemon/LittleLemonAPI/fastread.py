@@ -0,0 +1,199 @@
+import decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation returns database values unchanged, so rows
+# can be copied into the output without a call per value.
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.ReadOnlyField,
+)
+
+# Compiled readers keyed by serializer type, model and field set, like the
+# plans in optimizers.py. None records serializers the fast path can't handle.
+_readers = {}
+
+
+class RowReader:
+    """
+    Renders values_list() rows the way a ModelSerializer renders instances.
+
+    `render` is built once per serializer and turns one row into the
+    output dict. Reverse foreign keys rendered by a nested many=True
+    serializer are loaded with one extra query per page of rows.
+    """
+
+    def __init__(self, model, columns, render, nested):
+        self.model = model
+        self.columns = columns
+        self.render = render
+        self.nested = nested
+
+    def values(self, queryset, extra_columns=()):
+        """
+        `queryset` as named values_list() rows carrying every column the
+        serializer reads, plus `extra_columns` (e.g. keyset ordering fields).
+        """
+        columns = list(self.columns)
+        for name in extra_columns:
+            if name not in columns:
+                columns.append(name)
+        return queryset.prefetch_related(None).values_list(*columns, named=True)
+
+    def render_rows(self, rows):
+        children = tuple(nested.fetch(rows) for nested in self.nested)
+        render = self.render
+        return [render(row, children) for row in rows]
+
+
+class NestedReader:
+    """A reverse foreign key rendered by a nested many=True serializer."""
+
+    def __init__(self, reader, fk_attname, pk_index):
+        self.reader = reader
+        self.fk_attname = fk_attname
+        self.pk_index = pk_index
+
+    def fetch(self, rows):
+        ids = [row[self.pk_index] for row in rows]
+        if not ids:
+            return {}
+        model = self.reader.model
+        queryset = model._default_manager.filter(**{f'{self.fk_attname}__in': ids})
+        if not queryset.ordered:
+            queryset = queryset.order_by(model._meta.pk.attname)
+        children = self.reader.values(queryset, [self.fk_attname])
+        rendered = self.reader.render_rows(children)
+        grouped = {}
+        for row, data in zip(children, rendered):
+            grouped.setdefault(getattr(row, self.fk_attname), []).append(data)
+        return grouped
+
+
+def get_reader(serializer):
+    """
+    The compiled RowReader for `serializer`, or None when it uses something
+    the fast path can't reproduce exactly (method fields, custom
+    to_representation, dotted sources, hyperlinks...).
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    key = (type(serializer), _field_key(serializer))
+    if key not in _readers:
+        _readers[key] = _compile(serializer)
+    return _readers[key]
+
+
+def _field_key(serializer):
+    return tuple(
+        (name, type(field), field.source, _field_key(field.child) if isinstance(field, serializers.ListSerializer) else None)
+        for name, field in serializer.fields.items()
+    )
+
+
+def _compile(serializer):
+    if not isinstance(serializer, serializers.ModelSerializer):
+        return None
+    if type(serializer).to_representation is not serializers.Serializer.to_representation:
+        return None
+
+    model = serializer.Meta.model
+    pk = model._meta.pk.attname
+    columns = []
+    outputs = []
+    nested = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+        if isinstance(field, serializers.ListSerializer):
+            if not model_field.one_to_many:
+                return None
+            child = get_reader(field.child)
+            if child is None:
+                return None
+            index = _column(columns, pk)
+            nested.append(NestedReader(child, model_field.field.attname, index))
+            outputs.append((name, index, None, len(nested) - 1))
+            continue
+
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        if model_field.is_relation:
+            if not isinstance(field, serializers.PrimaryKeyRelatedField) or field.pk_field:
+                return None
+            convert = None
+        elif isinstance(field, PASSTHROUGH_FIELDS):
+            convert = None
+        elif isinstance(field, (serializers.BaseSerializer, serializers.RelatedField)):
+            return None
+        elif isinstance(field, serializers.DecimalField):
+            convert = _decimal_converter(field)
+        else:
+            convert = field.to_representation
+
+        outputs.append((name, _column(columns, model_field.attname), convert, None))
+
+    return RowReader(model, columns, _compile_render(outputs), nested)
+
+
+def _decimal_converter(field):
+    """
+    DecimalField.to_representation for the plain string case, with the
+    exponent and context built once instead of on every value.
+    """
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if (not coerce_to_string or field.localize or field.normalize_output
+            or field.decimal_places is None):
+        return field.to_representation
+
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return f'{value.quantize(exponent, rounding=rounding, context=context):f}'
+    return convert
+
+
+def _column(columns, attname):
+    if attname not in columns:
+        columns.append(attname)
+    return columns.index(attname)
+
+
+def _compile_render(outputs):
+    """
+    Builds `render(row, children)` from (key, row index, converter, nested
+    reader index) tuples, so rendering a row is one dict comprehension
+    instead of a pass over the field objects. None is passed through
+    unconverted, as DRF does.
+    """
+    outputs = tuple(outputs)
+
+    def render(row, children):
+        return {
+            name: (
+                children[nested].get(row[index]) or [] if nested is not None
+                else row[index] if convert is None or row[index] is None
+                else convert(row[index])
+            )
+            for name, index, convert, nested in outputs
+        }
+    return render
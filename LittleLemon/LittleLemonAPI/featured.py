@@ -0,0 +1,95 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .caching import LocalCache
+from .catalog import catalog_version
+from .models import MenuItem
+from .serializers import MenuItemSerializer
+from . import fastread
+
+SHARED_KEY = 'featured:{version}'
+REBUILD_KEY = 'featured:rebuild:{version}'
+# How long a rebuild may hold the lock, and how long others wait for it
+REBUILD_TIMEOUT = 5
+REBUILD_POLL = 0.05
+
+_local = LocalCache(maxsize=4, ttl=settings.FEATURED_CACHE_TTL)
+_lock = threading.Lock()
+# The last rendered list and its catalog version. Served past its TTL while
+# another worker rebuilds, but never after the catalog changed.
+_stale = None
+
+
+def featured_items(version=None):
+    """
+    The featured menu items, rendered like MenuItemSerializer.
+
+    Reads come from a process-local copy that lives for FEATURED_CACHE_TTL
+    seconds and is tied to catalog_version() (pass `version` if it is already
+    known), so any menu write elsewhere is picked up on the next read. On a
+    miss one thread per process rebuilds, and across processes the rebuild is
+    guarded by cache.add(): the winner queries the database and shares the
+    result through the Django cache, while the others serve their stale copy
+    or wait for it.
+    """
+    if version is None:
+        version = catalog_version()
+    data = _local.get(version)
+    if data is not None:
+        return data
+
+    global _stale
+    with _lock:
+        data = _local.get(version)
+        if data is None:
+            stale = None
+            if _stale is not None and _stale[0] == version:
+                stale = _stale[1]
+            data = _rebuild(version, stale)
+            _local.set(version, data)
+            _stale = (version, data)
+    return data
+
+
+def _rebuild(version, stale):
+    shared_key = SHARED_KEY.format(version=version)
+    data = cache.get(shared_key)
+    if data is not None:
+        return data
+
+    rebuild_key = REBUILD_KEY.format(version=version)
+    if cache.add(rebuild_key, True, REBUILD_TIMEOUT):
+        try:
+            data = _render()
+            cache.set(shared_key, data, settings.FEATURED_CACHE_TTL)
+        finally:
+            cache.delete(rebuild_key)
+        return data
+
+    if stale is not None:
+        return stale
+
+    deadline = time.monotonic() + REBUILD_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(REBUILD_POLL)
+        data = cache.get(shared_key)
+        if data is not None:
+            return data
+    # the rebuilding worker died or is stuck; don't keep the client waiting
+    return _render()
+
+
+def _render():
+    queryset = MenuItem.objects.filter(featured=True).order_by('price', 'id')
+    reader = fastread.get_reader(MenuItemSerializer)
+    return reader.render_rows(reader.values(queryset))
+
+
+def invalidate():
+    """Drops this process's copy; other processes notice the version bump."""
+    global _stale
+    _local.clear()
+    _stale = None
@@ -0,0 +1,45 @@
+from django_filters import rest_framework as filters
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from . import search
+from .models import MenuItem
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
+
+
+class MenuItemFilter(filters.FilterSet):
+    """
+    Category, featured and price filters for /api/menu-items.
+
+    Each combination is backed by one of MenuItem's composite indexes:
+    ?category=&price_min=&price_max= by (category, price), ?featured= with a
+    price range by (featured, price) and a bare price range by (price, id).
+    """
+    price_min = filters.NumberFilter(field_name='price', lookup_expr='gte')
+    price_max = filters.NumberFilter(field_name='price', lookup_expr='lte')
+    categories = NumberInFilter(field_name='category', lookup_expr='in')
+
+    class Meta:
+        model = MenuItem
+        fields = ['category', 'featured']
+
+
+class MenuItemSearchFilter(SearchFilter):
+    """
+    ?search= over menu item names and category titles using the FTS5 index.
+
+    Results are ranked by relevance unless the client asks for an explicit
+    ?ordering=. Backends without FTS5 fall back to SearchFilter on the view's
+    search_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip() or not search.is_supported():
+            return super().filter_queryset(request, queryset, view)
+
+        ranked = api_settings.ORDERING_PARAM not in request.query_params
+        return search.search(queryset, text, ranked=ranked)
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import LocalCache
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+_cache = LocalCache(
+    maxsize=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_KEY_TTL
+)
+
+
+class StoredResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.data = data
+
+
+def _cutoff():
+    return timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+
+def lookup(user, key):
+    """
+    Returns the StoredResponse recorded for (user, key), or None.
+
+    The local cache is checked first; on a miss the idempotency table is read
+    and the hit is cached for the rest of the key's lifetime.
+    """
+    stored = _cache.get((user.pk, key))
+    if stored is not None:
+        return stored
+
+    row = (
+        IdempotencyKey.objects
+        .filter(user=user, key=key, created__gte=_cutoff())
+        .values_list('status_code', 'response', 'created')
+        .first()
+    )
+    if row is None:
+        return None
+
+    status_code, data, created = row
+    stored = StoredResponse(status_code, data)
+    remaining = settings.IDEMPOTENCY_KEY_TTL - (timezone.now() - created).total_seconds()
+    _cache.set((user.pk, key), stored, ttl=remaining)
+    return stored
+
+
+def store(user, key, status_code, data):
+    """
+    Records the response for (user, key).
+
+    Must be called inside the transaction that produced the response, so the
+    key and the order are committed together. Expired keys are purged here,
+    which keeps the table bounded by the TTL. A concurrent request with the
+    same key makes this raise IntegrityError.
+    """
+    IdempotencyKey.objects.filter(created__lt=_cutoff()).delete()
+    IdempotencyKey.objects.create(
+        user=user,
+        key=key,
+        status_code=status_code,
+        response=data
+    )
+    stored = StoredResponse(status_code, data)
+    transaction.on_commit(lambda: _cache.set((user.pk, key), stored))
+
+
+def clear_cache():
+    _cache.clear()
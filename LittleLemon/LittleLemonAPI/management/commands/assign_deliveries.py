@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from LittleLemonAPI.assignment import assign_pending_orders, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Assigns unassigned open orders to the least busy delivery crew members'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Orders per UPDATE statement'
+        )
+
+    def handle(self, *args, **options):
+        assigned = assign_pending_orders(batch_size=options['batch_size'])
+
+        for driver_id, count in sorted(assigned.items()):
+            self.stdout.write(f'driver {driver_id}: {count} orders')
+        self.stdout.write(self.style.SUCCESS(
+            f'Assigned {sum(assigned.values())} orders to {len(assigned)} drivers'
+        ))
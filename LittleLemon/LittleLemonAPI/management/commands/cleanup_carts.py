@@ -0,0 +1,58 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from LittleLemonAPI.cart import delete_abandoned_carts, CLEANUP_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Deletes carts nobody has changed for a while, a small batch at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--age', type=int, default=settings.ABANDONED_CART_AGE,
+            help='Seconds since the last change before a cart counts as abandoned'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=CLEANUP_BATCH_SIZE,
+            help='Cart rows deleted per transaction'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Seconds to sleep between batches'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running, cleaning up every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=60 * 60,
+            help='Seconds between runs with --loop'
+        )
+
+    def handle(self, *args, **options):
+        if options['age'] < 0:
+            raise CommandError('--age must not be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        while True:
+            self.cleanup(options)
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def cleanup(self, options):
+        cutoff = timezone.now() - timedelta(seconds=options['age'])
+        started = time.perf_counter()
+        deleted, batches = delete_abandoned_carts(
+            cutoff, batch_size=options['batch_size'], pause=options['pause']
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {deleted} abandoned cart rows in {batches} batches '
+            f'in {elapsed:.2f}s ({deleted / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from LittleLemonAPI.menu_io import export_rows, format_for_path, FORMATS, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Writes every category and menu item as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Output file; - (the default) writes to stdout'
+        )
+        parser.add_argument(
+            '--format', choices=sorted(FORMATS),
+            help='File format; guessed from the extension by default, csv on stdout'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=BATCH_SIZE,
+            help='Rows fetched per query'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path == '-' else format_for_path(path))
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name, pass --format')
+        _, write = FORMATS[fmt]
+        rows = export_rows(chunk_size=options['chunk_size'])
+
+        if path == '-':
+            write(rows, self.stdout)
+            return
+        try:
+            with open(path, 'w', newline='', encoding='utf-8') as out:
+                write(rows, out)
+        except OSError as exc:
+            raise CommandError(exc)
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from LittleLemonAPI.menu_io import import_menu, format_for_path, FORMATS, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Upserts categories (by slug) and menu items (by name) from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument(
+            '--format', choices=sorted(FORMATS),
+            help='File format; guessed from the extension by default'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Rows written per bulk query'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Print the changes without saving them'
+        )
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or format_for_path(options['path'])
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name, pass --format')
+        dry_run = options['dry_run']
+
+        started = time.perf_counter()
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as file:
+                stats = import_menu(
+                    file, fmt,
+                    batch_size=options['batch_size'],
+                    dry_run=dry_run,
+                    diff=self.stdout.write if dry_run else None,
+                    errors=self.stderr.write,
+                )
+        except OSError as exc:
+            raise CommandError(exc)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Would import" if dry_run else "Imported"} {stats.rows} rows: '
+            f'{stats.created} items created, {stats.updated} updated, '
+            f'{stats.unchanged} unchanged, '
+            f'{stats.categories_created} categories created, '
+            f'{stats.categories_updated} renamed, {stats.errors} rejected '
+            f'in {elapsed:.2f}s ({stats.rows / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from LittleLemonAPI.reports import rebuild_daily_sales, REBUILD_CHUNK_DAYS
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the daily sales aggregates from orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-days', type=int, default=REBUILD_CHUNK_DAYS,
+            help='Days aggregated per query'
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_daily_sales(chunk_days=options['chunk_days'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} days of sales'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from LittleLemonAPI.cart import reprice_all_carts, REPRICE_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Moves every cart row to its menu item\'s current price'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=REPRICE_CHUNK_SIZE,
+            help='Cart rows per UPDATE statement'
+        )
+
+    def handle(self, *args, **options):
+        updated = reprice_all_carts(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Repriced {updated} cart rows'))
@@ -0,0 +1,272 @@
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+
+from .cart import reprice_menu_items
+from .catalog import bump_catalog_version
+from .models import Category, MenuItem
+from . import search
+
+BATCH_SIZE = 1000
+
+# One row per menu item. Categories without items are exported as rows with
+# an empty name, so a round trip keeps them.
+FIELDS = ['category_slug', 'category_title', 'name', 'price', 'featured']
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n', 'f'}
+
+
+class MenuRow:
+    __slots__ = ('line', 'slug', 'title', 'name', 'price', 'featured')
+
+    def __init__(self, line, slug, title, name, price, featured):
+        self.line = line
+        self.slug = slug
+        self.title = title
+        self.name = name
+        self.price = price
+        self.featured = featured
+
+
+class ImportStats:
+    def __init__(self):
+        self.rows = 0
+        self.errors = 0
+        self.categories_created = 0
+        self.categories_updated = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+
+
+def export_rows(chunk_size=BATCH_SIZE):
+    """Yields FIELDS dicts for every menu item, then every empty category."""
+    items = (
+        MenuItem.objects
+        .order_by('id')
+        .values_list('category__slug', 'category__title', 'name', 'price', 'featured')
+        .iterator(chunk_size=chunk_size)
+    )
+    for slug, title, name, price, featured in items:
+        yield {
+            'category_slug': slug or '',
+            'category_title': title or '',
+            'name': name,
+            'price': str(price),
+            'featured': featured,
+        }
+
+    empty = (
+        Category.objects
+        .filter(menuitem__isnull=True)
+        .order_by('id')
+        .values_list('slug', 'title')
+        .iterator(chunk_size=chunk_size)
+    )
+    for slug, title in empty:
+        yield {'category_slug': slug, 'category_title': title, 'name': '', 'price': '', 'featured': False}
+
+
+def write_csv(rows, out):
+    writer = csv.DictWriter(out, FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({**row, 'featured': 'true' if row['featured'] else 'false'})
+
+
+def write_ndjson(rows, out):
+    for row in rows:
+        out.write(json.dumps(row) + '\n')
+
+
+def read_csv(file):
+    """Yields (line number, row dict), reading one line at a time."""
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(file):
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError:
+            row = None
+        yield line, row if isinstance(row, dict) else {'_invalid': 'not a JSON object'}
+
+
+FORMATS = {
+    'csv': (read_csv, write_csv),
+    'ndjson': (read_ndjson, write_ndjson),
+}
+
+EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+def format_for_path(path):
+    """The FORMATS key matching the file extension, or None."""
+    path = str(path).lower()
+    for extension, fmt in EXTENSIONS.items():
+        if path.endswith(extension):
+            return fmt
+    return None
+
+
+def parse_row(line, row):
+    """Returns a MenuRow, or raises ValueError naming the bad column."""
+    if '_invalid' in row:
+        raise ValueError(row['_invalid'])
+
+    def text(key, max_length):
+        value = row.get(key)
+        value = '' if value is None else str(value).strip()
+        if len(value) > max_length:
+            raise ValueError(f'{key} is longer than {max_length} characters')
+        return value
+
+    slug = text('category_slug', Category._meta.get_field('slug').max_length)
+    title = text('category_title', Category._meta.get_field('title').max_length)
+    name = text('name', MenuItem._meta.get_field('name').max_length)
+    if not name and not slug:
+        raise ValueError('a row needs a name or a category_slug')
+    if not name:
+        return MenuRow(line, slug, title, '', None, False)
+
+    try:
+        price = Decimal(str(row.get('price', '')).strip())
+    except InvalidOperation:
+        raise ValueError('price is not a number')
+    if not price.is_finite() or price < 0 or price >= 10000 or price.as_tuple().exponent < -2:
+        raise ValueError('price must be between 0 and 9999.99 with at most 2 decimal places')
+
+    featured = row.get('featured', False)
+    if not isinstance(featured, bool):
+        value = str(featured or '').strip().lower()
+        if value not in TRUE_VALUES | FALSE_VALUES:
+            raise ValueError('featured must be true or false')
+        featured = value in TRUE_VALUES
+
+    return MenuRow(line, slug, title, name, price.quantize(Decimal('0.01')), featured)
+
+
+def import_menu(file, fmt='csv', batch_size=BATCH_SIZE, dry_run=False, diff=None, errors=None):
+    """
+    Upserts categories (by slug) and menu items (by name) from `file`.
+
+    The file is read lazily and written `batch_size` rows at a time with
+    bulk_create/bulk_update, so memory stays flat however big it is. Each
+    batch costs one SELECT and at most one INSERT and one UPDATE per model.
+    Everything runs in one transaction; with `dry_run` it is rolled back at
+    the end. `diff` and `errors` are called with one line of text per change
+    and per rejected row.
+    """
+    read, _ = FORMATS[fmt]
+    stats = ImportStats()
+    rows = read(file)
+    with transaction.atomic():
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                break
+            batch = []
+            for line, row in chunk:
+                stats.rows += 1
+                try:
+                    batch.append(parse_row(line, row))
+                except ValueError as exc:
+                    stats.errors += 1
+                    if errors:
+                        errors(f'line {line}: {exc}')
+            if batch:
+                _import_batch(batch, stats, diff)
+        if dry_run:
+            transaction.set_rollback(True)
+
+    changed = stats.categories_created + stats.categories_updated + stats.created + stats.updated
+    if changed and not dry_run:
+        bump_catalog_version()
+    return stats
+
+
+def _import_batch(batch, stats, diff):
+    categories = {}
+    # lowest id wins when slugs repeat, matching a plain .filter().first()
+    for category in Category.objects.filter(slug__in={row.slug for row in batch if row.slug}).order_by('-id'):
+        categories[category.slug] = category
+
+    renamed = {}
+    for row in batch:
+        if not row.slug:
+            continue
+        category = categories.get(row.slug)
+        if category is None:
+            categories[row.slug] = Category(slug=row.slug, title=row.title or row.slug)
+            stats.categories_created += 1
+            if diff:
+                diff(f'+ category {row.slug}')
+        elif row.title and row.title != category.title:
+            if diff:
+                diff(f'~ category {row.slug}: title {category.title!r} -> {row.title!r}')
+            category.title = row.title
+            if category.pk is not None and category.pk not in renamed:
+                renamed[category.pk] = category
+                stats.categories_updated += 1
+
+    Category.objects.bulk_create([c for c in categories.values() if c.pk is None])
+    if renamed:
+        Category.objects.bulk_update(renamed.values(), ['title'])
+
+    items = {}
+    for item in MenuItem.objects.filter(name__in={row.name for row in batch if row.name}).order_by('-id'):
+        items[item.name] = item
+
+    created = {}
+    updated = {}
+    for row in batch:
+        if not row.name:
+            continue
+        category = categories[row.slug] if row.slug else None
+        category_id = category.pk if category else None
+        item = items.get(row.name)
+        if item is None:
+            items[row.name] = created[row.name] = MenuItem(
+                name=row.name, price=row.price, featured=row.featured, category=category
+            )
+            stats.created += 1
+            if diff:
+                diff(f'+ item {row.name}: price {row.price}')
+            continue
+
+        changes = []
+        if item.price != row.price:
+            changes.append(f'price {item.price} -> {row.price}')
+        if item.featured != row.featured:
+            changes.append(f'featured {item.featured} -> {row.featured}')
+        if item.category_id != category_id:
+            changes.append(f'category {item.category_id} -> {row.slug or None}')
+        if not changes:
+            stats.unchanged += 1
+            continue
+
+        item.price, item.featured, item.category = row.price, row.featured, category
+        if item.pk is not None and item.pk not in updated:
+            updated[item.pk] = item
+            stats.updated += 1
+        if diff:
+            diff(f'~ item {row.name}: ' + ', '.join(changes))
+
+    MenuItem.objects.bulk_create(created.values())
+    if updated:
+        MenuItem.objects.bulk_update(updated.values(), ['price', 'featured', 'category'])
+
+    # bulk writes send no signals, so keep the search index in step here
+    search.index_menu_items([item.pk for item in created.values()] + list(updated))
+    reprice_menu_items(updated)
+    for category_id in renamed:
+        search.index_category(category_id)
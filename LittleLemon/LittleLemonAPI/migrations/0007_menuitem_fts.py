@@ -0,0 +1,42 @@
+from django.db import migrations
+
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE menuitem_fts USING fts5("
+    "name, category, tokenize='unicode61 remove_diacritics 2')",
+    "CREATE VIRTUAL TABLE menuitem_fts_vocab USING fts5vocab(menuitem_fts, 'row')",
+    'INSERT INTO menuitem_fts (rowid, name, category) '
+    'SELECT m."id", m."name", COALESCE(c."title", \'\') '
+    'FROM "LittleLemonAPI_menuitem" m '
+    'LEFT JOIN "LittleLemonAPI_category" c ON c."id" = m."category_id"',
+]
+
+DROP_SQL = [
+    "DROP TABLE IF EXISTS menuitem_fts_vocab",
+    "DROP TABLE IF EXISTS menuitem_fts",
+]
+
+
+def create_index(apps, schema_editor):
+    # FTS5 is SQLite only; other backends search with LIKE
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LittleLemonAPI', '0006_dailysales'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
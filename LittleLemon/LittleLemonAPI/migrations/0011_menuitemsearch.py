@@ -0,0 +1,25 @@
+# Generated by Django 6.1.2 on 2026-10-18 05:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LittleLemonAPI', '0010_catalogversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuItemSearch',
+            fields=[
+                ('menuitem', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='LittleLemonAPI.menuitem')),
+                ('document', models.TextField(db_column='menuitem_fts')),
+            ],
+            options={
+                'db_table': 'menuitem_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -15,12 +15,44 @@ class MenuItem(models.Model):
     featured = models.BooleanField(db_index=True, default=False)
     category = models.ForeignKey(Category, on_delete=models.PROTECT, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Price filters and ?ordering=price, alone or per category/featured
+            models.Index(fields=['price', 'id'], name='menuitem_price_id_idx'),
+            models.Index(fields=['category', 'price'], name='menuitem_category_price_idx'),
+            models.Index(fields=['featured', 'price'], name='menuitem_featured_price_idx'),
+        ]
+
+
+class MenuItemSearch(models.Model):
+    # Read-only view of the FTS5 table from migration 0007, kept in sync by
+    # search.py. `document` is FTS5's hidden column named after the table,
+    # which MATCH and bm25() take to mean the whole row.
+    menuitem = models.OneToOneField(
+        MenuItem, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+        db_constraint=False, related_name='search_entry'
+    )
+    document = models.TextField(db_column='menuitem_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'menuitem_fts'
+
+
+class CatalogVersion(models.Model):
+    # A single row whose token changes with every menu or category write, so
+    # all workers agree on it (see catalog.py)
+    version = models.CharField(max_length=32)
+
+
 class Cart(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     menuitem = models.ForeignKey(MenuItem, on_delete=models.CASCADE)
     quantity = models.SmallIntegerField()
     unit_price = models.DecimalField(max_digits=6, decimal_places=2)
     price = models.DecimalField(max_digits=6, decimal_places=2)
+    # Last time the customer changed this row; cleanup_carts expires old carts by it
+    updated = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ('menuitem', 'user')
@@ -41,6 +73,10 @@ class Order(models.Model):
     
     class Meta:
         ordering = ['-date', 'id']
+        indexes = [
+            # Matches the ordering above, so keyset pages are index range scans
+            models.Index(fields=['-date', 'id'], name='order_date_id_idx'),
+        ]
 
 
 class OrderItem(models.Model):
@@ -54,3 +90,22 @@ class OrderItem(models.Model):
         unique_together = ('order', 'menuitem')
 
 
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    status_code = models.SmallIntegerField()
+    response = models.JSONField()
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ('user', 'key')
+
+
+class DailySales(models.Model):
+    date = models.DateField(unique=True)
+    order_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    delivered_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['date']
@@ -0,0 +1,111 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+# Plans only depend on the serializer class and the fields it ended up with,
+# so they are computed once per combination instead of on every request.
+_plans = {}
+
+
+def optimize_queryset(queryset, serializer):
+    """
+    Adds the select_related/prefetch_related calls `serializer` needs.
+
+    `serializer` may be a serializer class, an instance or a many=True list
+    serializer. Only the fields the instance actually declares are looked at,
+    so relations dropped from a serializer are never fetched.
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    key = (type(serializer), queryset.model, _field_key(serializer))
+    plan = _plans.get(key)
+    if plan is None:
+        plan = _plans[key] = _plan(serializer, queryset.model)
+
+    select, prefetch = plan
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*_build_prefetches(prefetch))
+    return queryset
+
+
+def _field_key(serializer):
+    return tuple(
+        (name, type(field), field.source, _field_key(_nested(field)) if _nested(field) else None)
+        for name, field in serializer.fields.items()
+        if not field.write_only
+    )
+
+
+def _nested(field):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, serializers.ModelSerializer):
+        return field
+    return None
+
+
+def _build_prefetches(prefetch):
+    lookups = []
+    for lookup, model, (select, nested) in prefetch:
+        queryset = model._default_manager.all()
+        if select:
+            queryset = queryset.select_related(*select)
+        if nested:
+            queryset = queryset.prefetch_related(*_build_prefetches(nested))
+        lookups.append(Prefetch(lookup, queryset=queryset))
+    return lookups
+
+
+def _plan(serializer, model):
+    select = []
+    prefetch = []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        path = []
+        current = model
+        relation = None
+        for part in field.source.split('.'):
+            try:
+                relation = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                relation = None
+                break
+            if not relation.is_relation:
+                break
+            path.append(part)
+            if relation.many_to_many or relation.one_to_many:
+                break
+            current = relation.related_model
+        if not path:
+            continue
+
+        lookup = '__'.join(path)
+        many = relation is not None and (relation.many_to_many or relation.one_to_many)
+        nested = _nested(field)
+
+        if many:
+            nested_plan = _plan(nested, relation.related_model) if nested is not None else ((), ())
+            prefetch.append((lookup, relation.related_model, nested_plan))
+        elif nested is not None:
+            nested_select, nested_prefetch = _plan(nested, relation.related_model)
+            select.append(lookup)
+            select.extend(f'{lookup}__{name}' for name in nested_select)
+            for nested_lookup, nested_model, nested_plan in nested_prefetch:
+                prefetch.append((f'{lookup}__{nested_lookup}', nested_model, nested_plan))
+        elif len(path) > 1 or not _is_pk_only(field):
+            select.append(lookup)
+
+    return tuple(select), tuple(prefetch)
+
+
+def _is_pk_only(field):
+    # PrimaryKeyRelatedField reads <fk>_id straight off the instance
+    return isinstance(field, serializers.PrimaryKeyRelatedField) and not field.pk_field
@@ -0,0 +1,166 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset pagination on ?cursor=.
+
+    Clients that don't send a cursor keep the usual count/next/previous/results
+    pages. Sending ?cursor= (empty for the first page) returns next/previous/
+    results pages that seek on the queryset ordering, plus the primary key as a
+    tie breaker, instead of COUNT(*) and OFFSET. Orderings on nullable or
+    related fields fall back to page numbers.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = False
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        ordering = self.get_keyset_ordering(queryset)
+        if ordering is None:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.keyset = True
+        self.request = request
+        self.model = queryset.model
+        self.ordering = ordering
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            ordering = [(name, not descending) for name, descending in ordering]
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, position))
+        queryset = queryset.order_by(
+            *[('-' if descending else '') + name for name, descending in ordering]
+        )
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page_rows = results
+        return results
+
+    def get_keyset_ordering(self, queryset):
+        """Returns [(field name, descending)] ending in the pk, or None."""
+        if queryset.query.order_by:
+            order_by = queryset.query.order_by
+        elif queryset.query.default_ordering:
+            order_by = queryset.model._meta.ordering
+        else:
+            order_by = []
+
+        opts = queryset.model._meta
+        ordering = []
+        for item in order_by:
+            if not isinstance(item, str):
+                return None
+            descending = item.startswith('-')
+            name = item.lstrip('-')
+            if name == 'pk':
+                name = opts.pk.name
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if field.null or not field.concrete:
+                return None
+            ordering.append((field.attname, descending))
+
+        if opts.pk.attname not in [name for name, _ in ordering]:
+            ordering.append((opts.pk.attname, False))
+        return ordering
+
+    def seek_filter(self, ordering, position):
+        """(a, b) > (x, y) as a disjunction, honouring each field's direction."""
+        condition = Q()
+        for i, (name, descending) in enumerate(ordering):
+            term = Q(**{name + ('__lt' if descending else '__gt'): position[i]})
+            for j in range(i):
+                term &= Q(**{ordering[j][0]: position[j]})
+            condition |= term
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor.get('r', False))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        # the values end up in the seek filter, so they must fit their fields
+        try:
+            position = [
+                self.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, row, reverse):
+        position = [self.encode_value(getattr(row, name)) for name, _ in self.ordering]
+        cursor = {'p': position}
+        if reverse:
+            cursor['r'] = True
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode('ascii'))
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def encode_value(self, value):
+        if isinstance(value, (date, datetime, Decimal)):
+            return str(value)
+        return value
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self.encode_cursor(self.page_rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self.encode_cursor(self.page_rows[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
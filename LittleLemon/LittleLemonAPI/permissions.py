@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+from .roles import has_role, MANAGERS, CUSTOMERS
+
 class MenuItemPermission(BasePermission):
     def has_permission(self, request, view):
         if request.method == "GET":
@@ -8,18 +10,18 @@ class MenuItemPermission(BasePermission):
         return (
             request.user and
             request.user.is_authenticated and
-            request.user.groups.filter(name="managers").exists()
+            has_role(request, MANAGERS)
         )
 class ManagementPermission(BasePermission):
     def has_permission(self, request, view):
         return (
             request.user.is_authenticated and
-            request.user.groups.filter(name="managers").exists()
+            has_role(request, MANAGERS)
         )
     
 class CustomerPermission(BasePermission):
     def has_permission(self, request, view):
         return (
             request.user.is_authenticated and
-            request.user.groups.filter(name="customers").exists()
-        )
\ No newline at end of file
+            has_role(request, CUSTOMERS)
+        )
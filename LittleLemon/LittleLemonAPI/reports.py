@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+
+from .models import DailySales, Order
+
+REBUILD_CHUNK_DAYS = 31
+
+
+def record_sales(day, orders=0, revenue=0, delivered=0):
+    """
+    Applies a delta to the DailySales row for `day`.
+
+    Called from the same transaction as the order write it mirrors. The row is
+    incremented with F() expressions, so concurrent writers don't lose updates.
+    """
+    if not (orders or revenue or delivered):
+        return
+
+    changes = {
+        'order_count': F('order_count') + orders,
+        'revenue': F('revenue') + revenue,
+        'delivered_count': F('delivered_count') + delivered,
+    }
+    if DailySales.objects.filter(date=day).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            DailySales.objects.create(
+                date=day,
+                order_count=orders,
+                revenue=revenue,
+                delivered_count=delivered
+            )
+    except IntegrityError:
+        # Another transaction created the row first
+        DailySales.objects.filter(date=day).update(**changes)
+
+
+def record_order_change(before, after):
+    """
+    Records the difference between two sales_snapshot()s of an order; `before`
+    is None for a new order and `after` is None for a deleted one.
+    """
+    if before is not None and after is not None and before[0] != after[0]:
+        record_order_change(before, None)
+        record_order_change(None, after)
+        return
+
+    orders = revenue = delivered = 0
+    if before is not None:
+        orders -= 1
+        revenue -= before[1]
+        delivered -= int(before[2])
+    if after is not None:
+        orders += 1
+        revenue += after[1]
+        delivered += int(after[2])
+    record_sales((after or before)[0], orders, revenue, delivered)
+
+
+def sales_snapshot(order):
+    """The (date, total, status) of an order that DailySales depends on."""
+    return (order.date, order.total, order.status)
+
+
+def rebuild_daily_sales(chunk_days=REBUILD_CHUNK_DAYS):
+    """
+    Recomputes DailySales from Order.
+
+    Orders are aggregated one date range at a time, so each pass is a range
+    scan over the date index grouped into at most `chunk_days` rows.
+    Returns the number of DailySales rows written.
+    """
+    written = 0
+    with transaction.atomic():
+        DailySales.objects.all().delete()
+        bounds = Order.objects.aggregate(first=Min('date'), last=Max('date'))
+        if bounds['first'] is None:
+            return written
+
+        start = bounds['first']
+        while start <= bounds['last']:
+            end = start + timedelta(days=chunk_days)
+            rows = (
+                Order.objects
+                .filter(date__gte=start, date__lt=end)
+                .order_by()
+                .values('date')
+                .annotate(
+                    order_count=Count('id'),
+                    revenue=Sum('total'),
+                    delivered_count=Count('id', filter=Q(status=True))
+                )
+            )
+            written += len(DailySales.objects.bulk_create([DailySales(**row) for row in rows]))
+            start = end
+    return written
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.cache import cache
+
+MANAGERS = 'managers'
+DELIVERY = 'delivery'
+CUSTOMERS = 'customers'
+# Group assigned to every new user by signals.assign_default_group
+CUSTOMER = 'customer'
+
+
+def _cache_key(user_id):
+    return f'roles:{user_id}'
+
+
+def user_roles(user):
+    """
+    Returns the names of the user's groups as a frozenset.
+
+    The set is shared across requests through the Django cache and dropped by
+    the m2m_changed handler in signals.py whenever the user's groups change.
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+
+    key = _cache_key(user.pk)
+    roles = cache.get(key)
+    if roles is None:
+        roles = frozenset(user.groups.values_list('name', flat=True))
+        cache.set(key, roles, settings.ROLE_CACHE_TIMEOUT)
+    return roles
+
+
+def get_roles(request):
+    """user_roles() for request.user, resolved at most once per request."""
+    roles = getattr(request, '_roles', None)
+    if roles is None:
+        roles = request._roles = user_roles(request.user)
+    return roles
+
+
+def has_role(request, name):
+    return name in get_roles(request)
+
+
+def invalidate(user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
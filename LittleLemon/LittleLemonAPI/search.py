@@ -0,0 +1,161 @@
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, Lookup, Value
+
+from .models import Category, MenuItem, MenuItemSearch
+
+# SQLite FTS5 index over MenuItem.name and Category.title. The virtual tables
+# are created by migration 0007 and kept in sync by signals.py; rowid is the
+# MenuItem id. Other database backends fall back to SearchFilter's LIKE.
+FTS_TABLE = 'menuitem_fts'
+VOCAB_TABLE = 'menuitem_fts_vocab'
+
+# Every word is prefix-matched. Words of FUZZY_MIN_LENGTH or more characters
+# also match indexed terms one edit away (two edits from 8 characters on).
+FUZZY_MIN_LENGTH = 4
+FUZZY_MAX_CANDIDATES = 10
+
+
+class Match(Lookup):
+    """`document__match=expression`: an FTS5 full-text MATCH."""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+MenuItemSearch._meta.get_field('document').register_lookup(Match)
+
+
+def is_supported(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def _source_select(where):
+    return (
+        f'INSERT INTO {FTS_TABLE} (rowid, name, category) '
+        f'SELECT m."id", m."name", COALESCE(c."title", \'\') '
+        f'FROM "{MenuItem._meta.db_table}" m '
+        f'LEFT JOIN "{Category._meta.db_table}" c ON c."id" = m."category_id" '
+        f'WHERE {where}'
+    )
+
+
+def index_menu_items(ids):
+    """(Re)indexes the given menu items with one DELETE and one INSERT ... SELECT."""
+    ids = list(ids)
+    if not ids or not is_supported():
+        return
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', ids)
+        cursor.execute(_source_select(f'm."id" IN ({placeholders})'), ids)
+
+
+def index_category(category_id):
+    """Reindexes every item of a category after its title changed."""
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid IN '
+            f'(SELECT "id" FROM "{MenuItem._meta.db_table}" WHERE "category_id" = %s)',
+            [category_id]
+        )
+        cursor.execute(_source_select('m."category_id" = %s'), [category_id])
+
+
+def remove_menu_items(ids):
+    ids = list(ids)
+    if not ids or not is_supported():
+        return
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', ids)
+
+
+def rebuild_index():
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(_source_select('1'))
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _fuzzy_terms(cursor, token):
+    """
+    Vocabulary terms close to `token`. Only terms sharing its first letter are
+    considered, which keeps the vocabulary scan to one index range.
+    """
+    limit = 1 if len(token) < 8 else 2
+    cursor.execute(
+        f'SELECT term FROM {VOCAB_TABLE} WHERE term >= %s AND term < %s AND length(term) BETWEEN %s AND %s',
+        [token[0], chr(ord(token[0]) + 1), len(token) - limit, len(token) + limit]
+    )
+    terms = [term for (term,) in cursor.fetchall() if term != token]
+    terms = [term for term in terms if edit_distance(token, term, limit) <= limit]
+    return terms[:FUZZY_MAX_CANDIDATES]
+
+
+def build_match(text):
+    """
+    Turns user input into an FTS5 MATCH expression, or None if it has no words.
+
+    Every word must match, either as a prefix or, for longer words, as a
+    vocabulary term a typo or two away.
+    """
+    tokens = re.findall(r'\w+', text.lower())
+    if not tokens:
+        return None
+
+    clauses = []
+    with connection.cursor() as cursor:
+        for token in tokens:
+            alternatives = [f'"{token}"*']
+            if len(token) >= FUZZY_MIN_LENGTH:
+                alternatives += [f'"{term}"' for term in _fuzzy_terms(cursor, token)]
+            clauses.append('(' + ' OR '.join(alternatives) + ')')
+    return ' AND '.join(clauses)
+
+
+def search(queryset, text, ranked=True):
+    """
+    Restricts a MenuItem queryset to FTS matches for `text`, best match first
+    (bm25, with name hits ranked above category hits) unless `ranked` is False.
+    """
+    match = build_match(text)
+    if match is None:
+        return queryset.none()
+
+    queryset = queryset.filter(search_entry__document__match=match)
+    if ranked:
+        queryset = queryset.annotate(search_rank=Func(
+            F('search_entry__document'), Value(10.0), Value(1.0),
+            function='bm25', output_field=FloatField(),
+        )).order_by('search_rank', 'id')
+    return queryset
@@ -1,20 +1,171 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import MenuItem, Cart, Order, OrderItem, Category
+from .models import MenuItem, Cart, Order, OrderItem, Category, DailySales
+from .cart import add_to_cart, add_many_to_cart
 
 
-class MenuItemSerializer(serializers.ModelSerializer):
+class DynamicFieldsMixin:
+    """
+    Lets read requests trim the response with ?fields=a,b or ?omit=a,b.
+
+    Fields are dropped from the serializer itself rather than from its output,
+    so optimize_queryset never joins or prefetches relations nobody asked for.
+    Writes always use the full field set so validation is unaffected. Unknown
+    names are ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return
+
+        fields = _field_names(request.query_params.get('fields'))
+        omit = _field_names(request.query_params.get('omit'))
+        for name in list(self.fields):
+            if (fields and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+
+def _field_names(value):
+    if not value:
+        return set()
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class MenuItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = MenuItem
         fields = ['id', 'name', 'price']
 
-class CategorySerializer(serializers.ModelSerializer):
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that, inside a BulkListSerializer, reads from the
+    objects the list preloaded instead of running one query per row.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = getattr(self.parent.parent, 'preloaded', None)
+        if preloaded is None or self.field_name not in preloaded:
+            return super().to_internal_value(data)
+        pk = _pk(data)
+        if pk is None:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in preloaded[self.field_name]:
+            self.fail('does_not_exist', pk_value=data)
+        return preloaded[self.field_name][pk]
+
+
+def _pk(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validates a list in one pass: every BulkPrimaryKeyRelatedField of the
+    child is resolved for the whole batch with a single in_bulk() query.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.preloaded = {}
+            for name, field in self.child.fields.items():
+                if isinstance(field, BulkPrimaryKeyRelatedField) and not field.read_only:
+                    pks = {_pk(row.get(name)) for row in data if isinstance(row, dict)}
+                    pks.discard(None)
+                    self.preloaded[name] = field.get_queryset().in_bulk(pks)
+        return super().to_internal_value(data)
+
+
+class MenuItemBulkListSerializer(BulkListSerializer):
+    """
+    Writes a whole batch of menu items with bulk_create/bulk_update. For
+    updates `instance` is the {id: MenuItem} map of the rows being changed,
+    and each row must carry its `id`.
+    """
+
+    def to_internal_value(self, data):
+        self.matched = []
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        pk = data.get('id') if isinstance(data, dict) else None
+        instance = self.instance.get(pk) if type(pk) is int else None
+        if instance is None:
+            raise serializers.ValidationError({'id': ['No menu item with this id.']})
+        if instance in self.matched:
+            raise serializers.ValidationError({'id': ['Duplicate menu item id.']})
+
+        self.child.instance = instance
+        self.child.initial_data = data
+        attrs = super().run_child_validation(data)
+        self.matched.append(instance)
+        return attrs
+
+    def create(self, validated_data):
+        return MenuItem.objects.bulk_create([MenuItem(**attrs) for attrs in validated_data])
+
+    def update(self, instance, validated_data):
+        items = []
+        fields = set()
+        # rows are only saved when all of them validated, so they line up
+        for item, attrs in zip(self.matched, validated_data):
+            for name, value in attrs.items():
+                setattr(item, name, value)
+            fields.update(attrs)
+            items.append(item)
+        if fields:
+            MenuItem.objects.bulk_update(items, fields)
+        return items
+
+
+class MenuItemBulkSerializer(MenuItemSerializer):
+    category = BulkPrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True, required=False, write_only=True)
+    featured = serializers.BooleanField(required=False, write_only=True)
+
+    class Meta(MenuItemSerializer.Meta):
+        fields = MenuItemSerializer.Meta.fields + ['category', 'featured']
+        list_serializer_class = MenuItemBulkListSerializer
+
+
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'slug', 'title']
 
 
-class CartSerializer(serializers.ModelSerializer):
+class CategoryStatsSerializer(CategorySerializer):
+    """CategorySerializer plus the per-category aggregates CategoryView annotates."""
+    item_count = serializers.IntegerField(read_only=True)
+    min_price = serializers.DecimalField(max_digits=6, decimal_places=2, read_only=True)
+    max_price = serializers.DecimalField(max_digits=6, decimal_places=2, read_only=True)
+
+    class Meta(CategorySerializer.Meta):
+        fields = CategorySerializer.Meta.fields + ['item_count', 'min_price', 'max_price']
+
+
+class CartListSerializer(BulkListSerializer):
+    """A basket of cart items, upserted with one INSERT ... ON CONFLICT."""
+
+    def create(self, validated_data):
+        instances, self.created = add_many_to_cart(
+            self.context['request'].user,
+            [(attrs['menuitem'], attrs['quantity']) for attrs in validated_data],
+        )
+        return instances
+
+
+class CartSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    menuitem = BulkPrimaryKeyRelatedField(queryset=MenuItem.objects.all())
     unit_price = serializers.DecimalField(max_digits=6, decimal_places=2, read_only=True)
     price = serializers.DecimalField(max_digits=6, decimal_places=2, read_only=True)
     
@@ -22,17 +173,21 @@ class CartSerializer(serializers.ModelSerializer):
         model = Cart
         fields = ['id', 'user', 'menuitem', 'quantity', 'unit_price', 'price']
         read_only_fields = ['user', 'unit_price', 'price']
+        list_serializer_class = CartListSerializer
     
+    def validate_quantity(self, value):
+        if value < 1:
+            raise serializers.ValidationError('Quantity must be at least 1.')
+        return value
+
     def create(self, validated_data):
-        # Automatycznie pobierz cenę z MenuItem
-        menuitem = validated_data['menuitem']
-        quantity = validated_data['quantity']
-        
-        validated_data['unit_price'] = menuitem.price
-        validated_data['price'] = menuitem.price * quantity
-        validated_data['user'] = self.context['request'].user
-        
-        return super().create(validated_data)
+        # adding an item already in the cart increments it (see cart.add_to_cart)
+        instance, self.created = add_to_cart(
+            self.context['request'].user,
+            validated_data['menuitem'],
+            validated_data['quantity'],
+        )
+        return instance
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -41,9 +196,15 @@ class OrderItemSerializer(serializers.ModelSerializer):
         fields = ['id', 'order', 'menuitem', 'quantity', 'unit_price', 'price']
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     order_items = OrderItemSerializer(many=True, read_only=True)
     
     class Meta:
         model = Order
-        fields = ['id', 'user', 'delivery_crew', 'status', 'total', 'date', 'order_items']
\ No newline at end of file
+        fields = ['id', 'user', 'delivery_crew', 'status', 'total', 'date', 'order_items']
+
+
+class DailySalesSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailySales
+        fields = ['date', 'order_count', 'revenue', 'delivered_count']
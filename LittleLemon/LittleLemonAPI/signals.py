@@ -1,7 +1,35 @@
-from django.db.models.signals import post_save
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import User, Group
 
+from . import roles, search, featured
+from .cart import invalidate_summaries, reprice_menu_items
+from .catalog import bump_catalog_version
+from .models import MenuItem, Category, Cart
+
+
+_bulk = threading.local()
+
+
+@contextmanager
+def bulk_menu_delete():
+    """
+    Mutes the per-row MenuItem delete handlers below. The caller does their
+    work once for the whole set instead (see MenuItemsView.bulk_destroy).
+    """
+    _bulk.active = True
+    try:
+        yield
+    finally:
+        _bulk.active = False
+
+
+def _in_bulk_delete(sender):
+    return sender is MenuItem and getattr(_bulk, 'active', False)
+
 
 @receiver(post_save, sender=User)
 def assign_default_group(sender, instance, created, **kwargs):
@@ -9,3 +37,83 @@ def assign_default_group(sender, instance, created, **kwargs):
     if created:
         customer_group, _ = Group.objects.get_or_create(name='customer')
         instance.groups.add(customer_group)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drops cached role sets as soon as group membership changes"""
+    if reverse and action == 'pre_clear':
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        roles.invalidate([instance.pk])
+    elif action == 'post_clear':
+        roles.invalidate(instance.__dict__.pop('_cleared_user_ids', []))
+    else:
+        roles.invalidate(pk_set)
+
+
+@receiver(pre_delete, sender=Group)
+@receiver(post_save, sender=Group)
+def invalidate_group_member_roles(sender, instance, **kwargs):
+    """Renaming or deleting a group changes the role set of all its members"""
+    if kwargs.get('created'):
+        return
+    roles.invalidate(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_catalog(sender, **kwargs):
+    """Menu and category responses are cached per catalog version"""
+    if _in_bulk_delete(sender):
+        return
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+def invalidate_featured(sender, **kwargs):
+    if _in_bulk_delete(sender):
+        return
+    featured.invalidate()
+
+
+@receiver(post_save, sender=MenuItem)
+def index_menu_item(sender, instance, **kwargs):
+    search.index_menu_items([instance.pk])
+
+
+@receiver(post_delete, sender=MenuItem)
+def unindex_menu_item(sender, instance, **kwargs):
+    if _in_bulk_delete(sender):
+        return
+    search.remove_menu_items([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category(sender, instance, created, **kwargs):
+    """Items are indexed with their category title"""
+    if not created:
+        search.index_category(instance.pk)
+
+
+@receiver(pre_delete, sender=MenuItem)
+def invalidate_cart_summaries(sender, instance, **kwargs):
+    """Deleting a menu item cascades to the carts holding it"""
+    if _in_bulk_delete(sender):
+        return
+    invalidate_summaries(Cart.objects.filter(menuitem=instance).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=MenuItem)
+def reprice_carts(sender, instance, created, update_fields, **kwargs):
+    """Open carts follow menu price changes"""
+    if created or (update_fields is not None and 'price' not in update_fields):
+        return
+    reprice_menu_items([instance.pk])
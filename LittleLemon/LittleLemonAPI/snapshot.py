@@ -0,0 +1,223 @@
+import json
+import mmap
+import os
+import tempfile
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .catalog import catalog_version
+from .models import Category, MenuItem
+from .serializers import CategorySerializer, MenuItemSerializer
+
+
+def build_menu():
+    """
+    The whole menu grouped by category, from one select_related query.
+    Categories without items are left out; items without one are listed
+    under `uncategorized`.
+    """
+    category_serializer = CategorySerializer()
+    item_serializer = MenuItemSerializer()
+    categories = []
+    uncategorized = []
+    group = None
+    for item in MenuItem.objects.select_related('category').order_by('category_id', 'id'):
+        row = item_serializer.to_representation(item)
+        if item.category is None:
+            uncategorized.append(row)
+            continue
+        if group is None or group['id'] != item.category_id:
+            group = {**category_serializer.to_representation(item.category), 'menu_items': []}
+            categories.append(group)
+        group['menu_items'].append(row)
+    return {'categories': categories, 'uncategorized': uncategorized}
+
+
+# Snapshot file layout: one JSON header line, then the body. For every section
+# the body holds each row rendered by JSONRenderer, rows separated by commas,
+# so any page of rows is one contiguous byte range. Documents are whole
+# responses rendered once and served as one byte range.
+SECTIONS = {
+    'menu-items': (lambda: MenuItem.objects.order_by('id'), MenuItemSerializer),
+    'categories': (lambda: Category.objects.order_by('id'), CategorySerializer),
+}
+DOCUMENTS = {
+    'menu': build_menu,
+}
+
+_lock = threading.Lock()
+_current = None
+
+
+class Snapshot:
+    def __init__(self, identity, mapped):
+        self.identity = identity
+        self.mapped = mapped
+        header_end = mapped.find(b'\n') + 1
+        header = json.loads(mapped[:header_end])
+        self.version = header['version']
+        self.sections = header['sections']
+        self.documents = header.get('documents', {})
+        self.body = memoryview(mapped)[header_end:]
+
+    def rows(self, section, start, stop):
+        """The rendered rows [start, stop) as one comma-separated byte range."""
+        offsets = self.sections[section]
+        return self.body[offsets[start][0]:offsets[stop - 1][1]]
+
+    def document(self, name):
+        if name not in self.documents:
+            return None
+        start, stop = self.documents[name]
+        return self.body[start:stop]
+
+
+class SnapshotResponse(HttpResponse):
+    """
+    JSON response served from snapshot bytes. `data` decodes the body on
+    demand, so code that reads Response.data (tests, middleware) still works.
+    """
+
+    def __init__(self, content):
+        super().__init__(content, content_type='application/json')
+
+    @property
+    def data(self):
+        return json.loads(self.content)
+
+
+def build_snapshot(version):
+    """
+    Renders every section and atomically replaces the snapshot file.
+
+    The file is written next to the target and renamed over it, so workers
+    that still have the old file mapped keep reading a consistent copy.
+    """
+    path = os.fspath(settings.MENU_SNAPSHOT_PATH)
+    renderer = JSONRenderer()
+    sections = {}
+    chunks = []
+    position = 0
+    for name, (queryset, serializer_class) in SECTIONS.items():
+        offsets = []
+        for row in serializer_class(queryset(), many=True).data:
+            if offsets:
+                chunks.append(b',')
+                position += 1
+            rendered = renderer.render(row)
+            offsets.append((position, position + len(rendered)))
+            chunks.append(rendered)
+            position += len(rendered)
+        sections[name] = offsets
+
+    documents = {}
+    for name, build in DOCUMENTS.items():
+        rendered = renderer.render(build())
+        documents[name] = (position, position + len(rendered))
+        chunks.append(rendered)
+        position += len(rendered)
+
+    header = json.dumps({'version': version, 'sections': sections, 'documents': documents}).encode() + b'\n'
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.menu_snapshot')
+    try:
+        with os.fdopen(fd, 'wb') as temp:
+            temp.write(header)
+            temp.writelines(chunks)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _map(path):
+    """Maps the snapshot file, reusing the current mapping if it is unchanged."""
+    global _current
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if _current is not None and _current.identity == identity:
+        return _current
+
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    _current = Snapshot(identity, mapped)
+    return _current
+
+
+def get_snapshot(version=None):
+    """
+    Returns the snapshot for `version`, by default the current catalog version.
+
+    The file header records the version it was built for. The version
+    comes from the database, so every worker on the host agrees on whether
+    the file is current. Checking it costs a version lookup (unless given)
+    and a stat() call. A stale snapshot is rebuilt by the first request to
+    notice, and the other workers pick up the renamed file on their next
+    stat().
+    """
+    if version is None:
+        version = catalog_version()
+    path = os.fspath(settings.MENU_SNAPSHOT_PATH)
+    with _lock:
+        snapshot = _map(path)
+        if snapshot is None or snapshot.version != version:
+            build_snapshot(version)
+            snapshot = _map(path)
+    return snapshot if snapshot.version == version else None
+
+
+def render_page(section, request, page_size, version=None):
+    """
+    Renders the page-number page requested by `request` from the snapshot,
+    byte for byte as PageNumberPagination and JSONRenderer would. Returns None
+    when the page doesn't exist, so the caller can produce the usual 404.
+    """
+    try:
+        page = int(request.query_params.get('page', 1))
+    except ValueError:
+        return None
+
+    snapshot = get_snapshot(version)
+    if snapshot is None:
+        return None
+    count = len(snapshot.sections[section])
+    start = (page - 1) * page_size
+    if page < 1 or (start >= count and page != 1):
+        return None
+    stop = min(start + page_size, count)
+
+    url = request.build_absolute_uri()
+    next_link = replace_query_param(url, 'page', page + 1) if stop < count else None
+    if page == 1:
+        previous_link = None
+    elif page == 2:
+        previous_link = remove_query_param(url, 'page')
+    else:
+        previous_link = replace_query_param(url, 'page', page - 1)
+
+    envelope = b'{"count":%d,"next":%s,"previous":%s,"results":[' % (
+        count, json.dumps(next_link).encode(), json.dumps(previous_link).encode()
+    )
+    rows = snapshot.rows(section, start, stop) if stop > start else b''
+    return b''.join([envelope, rows, b']}'])
+
+
+def render_document(name, version=None):
+    """The pre-rendered JSON document `name`, or None if unavailable."""
+    snapshot = get_snapshot(version)
+    if snapshot is None:
+        return None
+    return snapshot.document(name)
+
+
+def reset():
+    global _current
+    with _lock:
+        _current = None
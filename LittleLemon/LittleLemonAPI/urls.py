@@ -1,11 +1,19 @@
 from django.urls import path
-from .views import MenuItemsView, GroupManagementView, GroupDeliveryView, CartView, OrderView, CategoryView
+from .views import MenuItemsView, MenuView, GroupManagementView, GroupDeliveryView, CartView, OrderView, CategoryView, DailySalesView
 
 urlpatterns = [
     path("menu-items", MenuItemsView.as_view(
         {
             'get': 'list',
-            'post': 'create'
+            'post': 'create',
+            'put': 'bulk_update',
+            'patch': 'bulk_partial_update',
+            'delete': 'bulk_destroy',
+        }
+    )),
+    path("menu-items/featured", MenuItemsView.as_view(
+        {
+            'get': 'featured'
         }
     )),
     path("menu-items/<int:pk>", MenuItemsView.as_view(
@@ -16,6 +24,11 @@ urlpatterns = [
             'delete': 'destroy',
         }
     )),
+    path('menu', MenuView.as_view(
+        {
+            'get': 'list'
+        }
+    )),
     path('groups/manager/users', GroupManagementView.as_view(
         {
             'get': 'list',
@@ -45,12 +58,32 @@ urlpatterns = [
             'delete': 'destroy'
         }
     )),
+    path('cart/summary', CartView.as_view(
+        {
+            'get': 'summary'
+        }
+    )),
     path('orders', OrderView.as_view(
         {
             'get': 'list',
             'post': 'create'
         }
     )),
+    path('orders/status', OrderView.as_view(
+        {
+            'patch': 'bulk_status'
+        }
+    )),
+    path('orders/assign', OrderView.as_view(
+        {
+            'post': 'assign'
+        }
+    )),
+    path('orders/export', OrderView.as_view(
+        {
+            'get': 'export'
+        }
+    )),
     path('orders/<int:pk>', OrderView.as_view(
         {
             'get': 'retrieve',
@@ -73,4 +106,9 @@ urlpatterns = [
             'delete': 'destroy',
         }
     )),
+    path('reports/daily-sales', DailySalesView.as_view(
+        {
+            'get': 'list'
+        }
+    )),
 ]
\ No newline at end of file
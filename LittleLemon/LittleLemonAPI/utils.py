@@ -0,0 +1,30 @@
+from django.db import connection
+
+
+class QueryCounter:
+    """
+    Counts the SQL statements executed on the default connection.
+
+    Works with DEBUG off, so it can be used to report query costs in production:
+
+        with QueryCounter() as counter:
+            ...
+        counter.count
+    """
+
+    def __init__(self, using=connection):
+        self.connection = using
+        self.count = 0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._wrapper.__exit__(exc_type, exc_value, traceback)
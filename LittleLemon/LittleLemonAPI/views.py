@@ -1,26 +1,320 @@
+import hashlib
+from decimal import Decimal
+
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status, viewsets
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.contrib.auth.models import User, Group
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
+from django.utils.http import parse_etags
 
-from .models import MenuItem, Cart, Order, OrderItem, Category
-from .serializers import MenuItemSerializer, CartSerializer, OrderSerializer, CategorySerializer
+from .models import MenuItem, Cart, Order, Category, DailySales
+from .serializers import (
+    MenuItemSerializer, MenuItemBulkSerializer, CartSerializer, OrderSerializer,
+    CategorySerializer, CategoryStatsSerializer, DailySalesSerializer,
+)
 from .permissions import MenuItemPermission, ManagementPermission, CustomerPermission
+from .pagination import KeysetPagination
+from .filters import MenuItemFilter, MenuItemSearchFilter
+from .optimizers import optimize_queryset
+from .roles import has_role, MANAGERS, DELIVERY, CUSTOMER
+from .catalog import catalog_version, bump_catalog_version
+from .checkout import checkout, EmptyCartError
+from .cart import cart_summary, invalidate_summaries, reprice_menu_items
+from .assignment import assign_pending_orders
+from .reports import record_sales, record_order_change, sales_snapshot
+from . import idempotency, exports, snapshot, fastread, search
+from .featured import featured_items, invalidate as invalidate_featured
+from .signals import bulk_menu_delete
+
+
+def date_range_filters(request, field='date'):
+    """
+    Turns ?start= and ?end= (YYYY-MM-DD, inclusive) into queryset filters.
+    Returns (filters, None), or (None, 400 response) for malformed dates.
+    """
+    filters = {}
+    for param, lookup in (('start', 'gte'), ('end', 'lte')):
+        value = request.query_params.get(param)
+        if value is None:
+            continue
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            return None, Response(
+                {"error": f"{param} must be a date in YYYY-MM-DD format"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        filters[f'{field}__{lookup}'] = day
+    return filters, None
+
+
+class CatalogETagMixin:
+    """
+    Strong ETags for catalog reads, derived from catalog_version().
+
+    A matching If-None-Match is answered with 304 before the queryset is
+    built, so an unchanged menu costs one version lookup and no list query
+    or serialization.
+    """
+
+    def catalog_version(self):
+        """catalog_version(), looked up once per request."""
+        if not hasattr(self, '_catalog_version'):
+            self._catalog_version = catalog_version()
+        return self._catalog_version
+
+    def catalog_etag(self, request):
+        key = '|'.join([
+            self.catalog_version(),
+            request.get_full_path(),
+            request.accepted_media_type or '',
+        ])
+        return '"%s"' % hashlib.sha1(key.encode()).hexdigest()
+
+    def conditional(self, request, render, *args, **kwargs):
+        etag = self.catalog_etag(request)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response = render(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(request, super().retrieve, *args, **kwargs)
+
+
+class SnapshotListMixin:
+    """
+    Serves unfiltered JSON list pages from the shared menu snapshot.
+
+    Only ?page= may be present; anything else (filters, ordering, cursors,
+    other renderers) goes through the regular list.
+    """
+    snapshot_section = None
+
+    def list(self, request, *args, **kwargs):
+        if set(request.query_params) <= {'page'} and request.accepted_renderer.format == 'json':
+            body = snapshot.render_page(
+                self.snapshot_section, request, self.paginator.get_page_size(request),
+                self.catalog_version(),
+            )
+            if body is not None:
+                return snapshot.SnapshotResponse(body)
+        return super().list(request, *args, **kwargs)
+
+
+class FastListMixin:
+    """
+    Lists through fastread when the serializer allows it: rows are fetched
+    with values_list() and rendered by a prebuilt function, skipping model
+    instantiation and the per-field serializer machinery. Output is the same
+    as the regular list; serializers fastread can't reproduce fall back to it.
+    """
+
+    def list(self, request, *args, **kwargs):
+        reader = fastread.get_reader(self.get_serializer())
+        if reader is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # keyset pagination reads its cursor position off the rows
+        get_ordering = getattr(self.paginator, 'get_keyset_ordering', None)
+        ordering = get_ordering(queryset) if get_ordering else None
+        rows = reader.values(queryset, [name for name, _ in ordering or ()])
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.render_rows(page))
+        return Response(reader.render_rows(list(rows)))
 
 
 # Create your views here.
-class MenuItemsView(viewsets.ModelViewSet):
+class MenuItemsView(CatalogETagMixin, SnapshotListMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = MenuItem.objects.all().order_by("id")
     serializer_class = MenuItemSerializer
     permission_classes = [MenuItemPermission]
+    pagination_class = KeysetPagination
+    snapshot_section = 'menu-items'
+    filter_backends = [DjangoFilterBackend, OrderingFilter, MenuItemSearchFilter]
     ordering_fields = ['price']
-    filterset_fields = ['category']
+    filterset_class = MenuItemFilter
+    search_fields = ['name', 'category__title']
+    bulk_limit = 500
+
+    def get_queryset(self):
+        return optimize_queryset(super().get_queryset(), self.get_serializer())
+
+    def featured(self, request):
+        return self.conditional(request, lambda request: Response(featured_items(self.catalog_version())))
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        error = self.check_bulk_payload(request.data, 'menu items')
+        if error:
+            return error
+        serializer = MenuItemBulkSerializer(
+            data=request.data, many=True, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            items = serializer.save()
+            self.bulk_written([item.pk for item in items])
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, request, partial=False):
+        error = self.check_bulk_payload(request.data, 'menu items')
+        if error:
+            return error
+        ids = [row.get('id') for row in request.data if isinstance(row, dict)]
+        with transaction.atomic():
+            items = MenuItem.objects.select_for_update().in_bulk(
+                [pk for pk in ids if type(pk) is int]
+            )
+            serializer = MenuItemBulkSerializer(
+                items, data=request.data, many=True, partial=partial,
+                context=self.get_serializer_context()
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            self.bulk_written(
+                list(items),
+                repriced=any('price' in row for row in serializer.validated_data),
+            )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def bulk_partial_update(self, request):
+        return self.bulk_update(request, partial=True)
+
+    def bulk_destroy(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        error = self.check_bulk_payload(ids, 'menu item ids')
+        if error:
+            return error
+        if not all(type(pk) is int for pk in ids):
+            return Response(
+                {"error": "ids must be a list of menu item ids"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic(), bulk_menu_delete():
+            found = set(MenuItem.objects.filter(id__in=ids).values_list('id', flat=True))
+            if found:
+                self.bulk_deleted(found)
+        return Response(
+            {
+                'results': [
+                    {'id': pk, 'result': 'deleted' if pk in found else 'not_found'}
+                    for pk in dict.fromkeys(ids)
+                ]
+            },
+            status=status.HTTP_200_OK
+        )
 
-class CategoryView(viewsets.ModelViewSet):
+    def check_bulk_payload(self, rows, name):
+        if not isinstance(rows, list) or not rows or len(rows) > self.bulk_limit:
+            return Response(
+                {"error": f"Expected a list of 1-{self.bulk_limit} {name}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return None
+
+    def bulk_deleted(self, ids):
+        # the per-row delete signals are muted, so do their work once
+        invalidate_summaries(
+            Cart.objects.filter(menuitem_id__in=ids).values_list('user_id', flat=True).distinct()
+        )
+        MenuItem.objects.filter(id__in=ids).delete()
+        bump_catalog_version()
+        search.remove_menu_items(ids)
+        invalidate_featured()
+
+    def bulk_written(self, ids, repriced=False):
+        # bulk_create/bulk_update send no post_save, so do what the signals would
+        bump_catalog_version()
+        search.index_menu_items(ids)
+        if repriced:
+            reprice_menu_items(ids)
+
+
+class CategoryView(CatalogETagMixin, SnapshotListMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [MenuItemPermission]
+    snapshot_section = 'categories'
+
+    @property
+    def with_stats(self):
+        return self.request.query_params.get('with_stats', '').lower() in ('1', 'true', 'yes')
+
+    def get_serializer_class(self):
+        return CategoryStatsSerializer if self.with_stats else CategorySerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.with_stats:
+            # one grouped query over the category/menu item join
+            queryset = queryset.annotate(
+                item_count=Count('menuitem'),
+                min_price=Min('menuitem__price'),
+                max_price=Max('menuitem__price'),
+            ).order_by('id')  # Meta.ordering is ignored on grouped queries
+        return optimize_queryset(queryset, self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        """
+        ?with_stats= pages are cached per catalog version, so any MenuItem or
+        Category write invalidates them. A miss goes through the regular
+        list, mixins included.
+        """
+        if not self.with_stats:
+            return super().list(request, *args, **kwargs)
+
+        key = 'categories:stats:' + hashlib.sha1(
+            f'{self.catalog_version()}|{request.build_absolute_uri()}'.encode()
+        ).hexdigest()
+        data = cache.get(key)
+        if data is not None:
+            return self.conditional(request, lambda request: Response(data))
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.CATEGORY_STATS_CACHE_TIMEOUT)
+        return response
+
+
+class MenuView(CatalogETagMixin, viewsets.ViewSet):
+    """The whole menu grouped by category, served pre-rendered from the snapshot."""
+    permission_classes = [MenuItemPermission]
+
+    def list(self, request):
+        return self.conditional(request, self.render_menu)
+
+    def render_menu(self, request):
+        if request.accepted_renderer.format == 'json':
+            body = snapshot.render_document('menu', self.catalog_version())
+            if body is not None:
+                return snapshot.SnapshotResponse(body)
+        return Response(snapshot.build_menu())
+
 
 class GroupManagementView(viewsets.ViewSet):
     permission_classes = [ManagementPermission]
@@ -88,43 +382,62 @@ class GroupDeliveryView(viewsets.ViewSet):
 
 class CartView(viewsets.ViewSet):
     permission_classes = [CustomerPermission]
+    bulk_limit = 100
 
     def list(self, request):
-        items = Cart.objects.filter(user=request.user)
-        serializer = CartSerializer(items, many=True)
+        context = {'request': request}
+        items = optimize_queryset(Cart.objects.filter(user=request.user), CartSerializer(context=context))
+        serializer = CartSerializer(items, many=True, context=context)
         return Response(serializer.data)
     
     def create(self, request):
-        serializer = CartSerializer(data=request.data, context={'request': request})
+        if isinstance(request.data, list):
+            # a whole basket: one menu item lookup and one upsert for all rows
+            serializer = CartSerializer(
+                data=request.data, many=True, allow_empty=False, max_length=self.bulk_limit,
+                context={'request': request}
+            )
+        else:
+            serializer = CartSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED if serializer.created else status.HTTP_200_OK
+        )
     
+    def summary(self, request):
+        return Response(cart_summary(request.user))
+
     def destroy(self, request):
         Cart.objects.filter(user=request.user).delete()
+        invalidate_summaries([request.user.pk])
         return Response(
             {'message': 'deleted cart'},
             status=status.HTTP_200_OK
         )
     
-class OrderView(viewsets.ModelViewSet):
+class OrderView(FastListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = OrderSerializer
+    pagination_class = KeysetPagination
+    bulk_status_limit = 500
 
     def get_queryset(self):
         user = self.request.user
-        if user.groups.filter(name='managers').exists():
-            return Order.objects.all()
-        elif user.groups.filter(name='delivery').exists():
-            return Order.objects.filter(delivery_crew=user)
+        if has_role(self.request, MANAGERS):
+            queryset = Order.objects.all()
+        elif has_role(self.request, DELIVERY):
+            queryset = Order.objects.filter(delivery_crew=user)
         else:
-            return Order.objects.filter(user=user)
+            queryset = Order.objects.filter(user=user)
+        return optimize_queryset(queryset, self.get_serializer())
         
     def update(self, request, *args, **kwargs):
         if kwargs.get("partial"):
             return super().update(request, *args, **kwargs)
 
-        if not request.user.groups.filter(name='managers').exists():
+        if not has_role(request, MANAGERS):
             return Response(
                 {"error": "Only managers can update orders"},
                 status=status.HTTP_403_FORBIDDEN
@@ -132,16 +445,10 @@ class OrderView(viewsets.ModelViewSet):
         return super().update(request, *args, **kwargs)
     
     def partial_update(self, request, *args, **kwargs):
-        print(f"User: {request.user.username}")
-        print(f"Groups: {list(request.user.groups.values_list('name', flat=True))}")
-        print(request.user.groups.filter(name='delivery').exists())
-        print(set(request.data.keys()) != {'status'})
-        print(set(request.data.keys()))
-
-        if request.user.groups.filter(name='managers').exists():
+        if has_role(request, MANAGERS):
             return super().partial_update(request, *args, **kwargs)
         
-        elif request.user.groups.filter(name='delivery').exists():
+        elif has_role(request, DELIVERY):
             if set(request.data.keys()) != {'status'}:
                 return Response(
                     {"error": "Delivery crew can only update status"},
@@ -163,46 +470,214 @@ class OrderView(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
+    def bulk_status(self, request):
+        if has_role(request, MANAGERS):
+            queryset = Order.objects.all()
+        elif has_role(request, DELIVERY):
+            queryset = Order.objects.filter(delivery_crew=request.user)
+        else:
+            return Response(
+                {'error': 'Customers cant update orders'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        if not isinstance(request.data, dict):
+            return Response(
+                {"error": "Send an object with orders and status"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if set(request.data.keys()) != {'orders', 'status'}:
+            return Response(
+                {"error": "Only orders and status can be sent"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        order_status = request.data.get("status")
+        if order_status not in [0, 1, True, False]:
+            return Response(
+                {"error": "Status must be 0, 1, true, or false"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        order_ids = request.data.get("orders")
+        if (
+            not isinstance(order_ids, list) or
+            not order_ids or
+            len(order_ids) > self.bulk_status_limit or
+            not all(type(order_id) is int for order_id in order_ids)
+        ):
+            return Response(
+                {"error": f"orders must be a list of 1-{self.bulk_status_limit} order ids"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        order_status = bool(order_status)
+        with transaction.atomic():
+            rows = queryset.filter(id__in=order_ids).values_list('id', 'date', 'status')
+            owned = set()
+            changed_per_day = {}
+            for order_id, day, current_status in rows:
+                owned.add(order_id)
+                if current_status != order_status:
+                    changed_per_day[day] = changed_per_day.get(day, 0) + 1
+            if owned:
+                Order.objects.filter(id__in=owned).update(status=order_status)
+            for day, changed in changed_per_day.items():
+                record_sales(day, delivered=changed if order_status else -changed)
+
+        return Response(
+            {
+                'results': [
+                    {'id': order_id, 'result': 'updated' if order_id in owned else 'not_found'}
+                    for order_id in dict.fromkeys(order_ids)
+                ]
+            },
+            status=status.HTTP_200_OK
+        )
+
+    def assign(self, request):
+        if not has_role(request, MANAGERS):
+            return Response(
+                {"error": "Only managers can assign orders"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        assigned = assign_pending_orders()
+        return Response(
+            {
+                'assigned': sum(assigned.values()),
+                'drivers': [
+                    {'id': driver_id, 'assigned': count}
+                    for driver_id, count in sorted(assigned.items())
+                ]
+            },
+            status=status.HTTP_200_OK
+        )
+
+    def export(self, request):
+        if not has_role(request, MANAGERS):
+            return Response(
+                {"error": "Only managers can export orders"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        output = request.query_params.get('output', 'csv')
+        if output not in exports.FORMATS:
+            return Response(
+                {"error": f"output must be one of: {', '.join(exports.FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        filters, error = date_range_filters(request)
+        if error is not None:
+            return error
+        order_status = request.query_params.get('status')
+        if order_status is not None:
+            if order_status not in ('0', '1', 'true', 'false'):
+                return Response(
+                    {"error": "Status must be 0, 1, true, or false"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            filters['status'] = order_status in ('1', 'true')
+
+        stream, content_type, filename = exports.FORMATS[output]
+        response = StreamingHttpResponse(
+            stream(Order.objects.filter(**filters)),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
     def destroy(self, request, *args, **kwargs):
-        if not request.user.groups.filter(name='managers').exists():
+        if not has_role(request, MANAGERS):
             return Response(
                 {"error": "Only managers can delete orders"},
                 status=status.HTTP_403_FORBIDDEN
             )
         return super().destroy(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        before = sales_snapshot(serializer.instance)
+        with transaction.atomic():
+            order = serializer.save()
+            record_order_change(before, sales_snapshot(order))
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            record_order_change(sales_snapshot(instance), None)
+            instance.delete()
     
     def create(self, request):
-        if not request.user.groups.filter(name='customer').exists():
+        if not has_role(request, CUSTOMER):
             return Response(
                 {"error": "Only customers can create orders"},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        cart = Cart.objects.filter(user=request.user)
-        if not cart.exists():
+        key = request.headers.get(idempotency.HEADER)
+        if key is not None:
+            if not key or len(key) > idempotency.MAX_KEY_LENGTH:
+                return Response(
+                    {"error": f"{idempotency.HEADER} must be 1-{idempotency.MAX_KEY_LENGTH} characters"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            stored = idempotency.lookup(request.user, key)
+            if stored is not None:
+                return self._replay(stored)
+
+        try:
+            with transaction.atomic():
+                result = checkout(request.user)
+                data = OrderSerializer(result.order).data
+                if key is not None:
+                    idempotency.store(request.user, key, status.HTTP_201_CREATED, data)
+        except EmptyCartError:
+            # A concurrent retry with the same key checked the cart out while
+            # this one waited for the lock
+            stored = idempotency.lookup(request.user, key) if key is not None else None
+            if stored is not None:
+                return self._replay(stored)
             return Response(
                 {"message": "Cart is empty"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        order = Order.objects.create(user=request.user)
+        except IntegrityError:
+            # A concurrent retry with the same key committed first
+            stored = idempotency.lookup(request.user, key) if key is not None else None
+            if stored is None:
+                raise
+            return self._replay(stored)
 
-        for item in cart:
-            OrderItem.objects.create(
-                order=order,
-                menuitem=item.menuitem,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                price=item.price
-            )
-        
-        order.total = sum(item.price for item in order.order_items.all())
-        order.save()
+        return Response(
+            data,
+            status=status.HTTP_201_CREATED,
+            headers={'X-Checkout-Queries': str(result.query_count)}
+        )
 
-        cart.delete()
-        serializer = OrderSerializer(order)
+    def _replay(self, stored):
+        return Response(
+            stored.data,
+            status=stored.status_code,
+            headers={'Idempotent-Replayed': 'true'}
+        )
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-    
 
-        
-    
+class DailySalesView(viewsets.ViewSet):
+    permission_classes = [ManagementPermission]
+
+    def list(self, request):
+        filters, error = date_range_filters(request)
+        if error is not None:
+            return error
+        days = DailySales.objects.filter(**filters)
+
+        serializer = DailySalesSerializer(days, many=True)
+        totals = days.aggregate(
+            order_count=Coalesce(Sum('order_count'), 0),
+            revenue=Coalesce(Sum('revenue'), Value(Decimal('0.00'))),
+            delivered_count=Coalesce(Sum('delivered_count'), 0)
+        )
+        totals['revenue'] = f"{totals['revenue']:.2f}"
+        return Response({'days': serializer.data, 'totals': totals})
+
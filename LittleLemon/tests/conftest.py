@@ -1,6 +1,9 @@
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User, Group
+from django.core.cache import cache
+
+from LittleLemonAPI import idempotency, snapshot, featured
 
 pytest_plugins = [
     'tests.fixtures.users',
@@ -8,3 +11,18 @@ pytest_plugins = [
     'tests.fixtures.cart',
     'tests.fixtures.orders',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(settings, tmp_path):
+    """Caches must not leak state between tests"""
+    settings.MENU_SNAPSHOT_PATH = tmp_path / 'menu_snapshot.bin'
+    cache.clear()
+    idempotency.clear_cache()
+    snapshot.reset()
+    featured.invalidate()
+    yield
+    cache.clear()
+    idempotency.clear_cache()
+    snapshot.reset()
+    featured.invalidate()
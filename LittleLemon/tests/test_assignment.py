@@ -0,0 +1,102 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.assignment import assign_pending_orders
+from LittleLemonAPI.models import Order
+
+
+@pytest.mark.django_db
+class TestDeliveryAssignment:
+    """Tests for load-balanced delivery assignment"""
+
+    def test_orders_are_spread_evenly(self, create_user, customer_user, create_order):
+        """Pending orders are split evenly across drivers with no open orders"""
+        drivers = [create_user(username=f'driver{i}', groups=['delivery']) for i in range(3)]
+        for _ in range(9):
+            create_order(user=customer_user)
+
+        assigned = assign_pending_orders()
+
+        assert assigned == {driver.id: 3 for driver in drivers}
+        assert not Order.objects.filter(delivery_crew__isnull=True).exists()
+
+    def test_busy_drivers_get_fewer_orders(self, create_user, customer_user, create_order):
+        """Current open orders count towards each driver's load, delivered ones don't"""
+        busy = create_user(username='busy', groups=['delivery'])
+        idle = create_user(username='idle', groups=['delivery'])
+        for _ in range(4):
+            create_order(user=customer_user, delivery_crew=busy)
+        create_order(user=customer_user, delivery_crew=idle, status=True)
+        for _ in range(6):
+            create_order(user=customer_user)
+
+        assigned = assign_pending_orders()
+
+        assert assigned == {busy.id: 1, idle.id: 5}
+
+    def test_closed_and_assigned_orders_are_left_alone(self, delivery_user, customer_user, create_user, create_order):
+        """Only open orders without delivery crew are assigned"""
+        other = create_user(username='other', groups=['delivery'])
+        delivered = create_order(user=customer_user, status=True)
+        taken = create_order(user=customer_user, delivery_crew=other)
+
+        assign_pending_orders()
+
+        delivered.refresh_from_db()
+        taken.refresh_from_db()
+        assert delivered.delivery_crew is None
+        assert taken.delivery_crew == other
+
+    def test_query_count_does_not_grow_with_orders(self, delivery_user, customer_user, create_order):
+        """One pass costs the same queries for 5 or 50 orders when they fit one batch"""
+        for _ in range(5):
+            create_order(user=customer_user)
+        with CaptureQueriesContext(connection) as small:
+            assign_pending_orders()
+
+        for _ in range(50):
+            create_order(user=customer_user)
+        with CaptureQueriesContext(connection) as large:
+            assign_pending_orders()
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+    def test_no_drivers_assigns_nothing(self, customer_user, create_order):
+        """Without delivery crew nothing is assigned"""
+        create_order(user=customer_user)
+
+        assert assign_pending_orders() == {}
+
+    def test_management_command(self, delivery_user, customer_user, create_order):
+        """manage.py assign_deliveries runs an assignment pass"""
+        create_order(user=customer_user)
+        out = StringIO()
+
+        call_command('assign_deliveries', stdout=out)
+
+        assert 'Assigned 1 orders to 1 drivers' in out.getvalue()
+
+    def test_manager_endpoint(self, api_client, manager_user, delivery_user, customer_user, create_order):
+        """POST /api/orders/assign runs an assignment pass for managers"""
+        create_order(user=customer_user)
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.post('/api/orders/assign')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'assigned': 1, 'drivers': [{'id': delivery_user.id, 'assigned': 1}]}
+
+    def test_delivery_cannot_use_endpoint(self, api_client, delivery_user):
+        """POST /api/orders/assign is forbidden for delivery crew"""
+        token = Token.objects.create(user=delivery_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.post('/api/orders/assign')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
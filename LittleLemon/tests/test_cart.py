@@ -1,6 +1,11 @@
+from decimal import Decimal
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.authtoken.models import Token
+from LittleLemonAPI import cart
 from LittleLemonAPI.models import Cart
 
 
@@ -220,3 +225,216 @@ class TestCartUnauthenticated:
         response = api_client.delete('/api/cart/menu-items')
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestCartUpsert:
+    """Tests for adding an item that is already in the cart"""
+
+    def test_repeat_add_increments_quantity(self, api_client, customer_user, menu_item):
+        """A second POST for the same item merges into the existing row -> 200"""
+        token = Token.objects.create(user=customer_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        first = api_client.post('/api/cart/menu-items', {'menuitem': menu_item.id, 'quantity': 2})
+        second = api_client.post('/api/cart/menu-items', {'menuitem': menu_item.id, 'quantity': 3})
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data['id'] == first.data['id']
+        assert second.data['quantity'] == 5
+        cart_item = Cart.objects.get(user=customer_user, menuitem=menu_item)
+        assert cart_item.quantity == 5
+        assert cart_item.price == cart_item.unit_price * 5
+
+    def test_merge_is_a_single_update(self, customer_user, menu_item, create_cart_item):
+        """The increment happens in the database, not read-modify-write"""
+        create_cart_item(user=customer_user, menuitem=menu_item, quantity=1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            row, created = cart.add_to_cart(customer_user, menu_item, 4)
+
+        assert not created and row.quantity == 5
+        assert ctx.captured_queries[0]['sql'].startswith('UPDATE')
+        assert '"quantity" = ("LittleLemonAPI_cart"."quantity" + 4)' in ctx.captured_queries[0]['sql']
+
+    def test_lost_insert_race_falls_back_to_update(self, customer_user, menu_item, create_cart_item, monkeypatch):
+        """If another request inserts first, the add is applied as an increment"""
+        create_cart_item(user=customer_user, menuitem=menu_item, quantity=1)
+        merge = cart._merge
+        calls = []
+
+        def miss_first_time(*args):
+            calls.append(args)
+            return 0 if len(calls) == 1 else merge(*args)
+
+        monkeypatch.setattr(cart, '_merge', miss_first_time)
+        row, created = cart.add_to_cart(customer_user, menu_item, 2)
+
+        assert not created and row.quantity == 3
+        assert Cart.objects.filter(user=customer_user).count() == 1
+
+    def test_quantity_must_be_positive(self, api_client, customer_user, menu_item):
+        """Zero or negative quantities are rejected -> 400"""
+        token = Token.objects.create(user=customer_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.post('/api/cart/menu-items', {'menuitem': menu_item.id, 'quantity': 0})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestCartBatchAdd:
+    """Tests for POST /api/cart/menu-items with a list payload"""
+
+    def auth(self, api_client, user):
+        token = Token.objects.create(user=user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_basket_is_added(self, api_client, customer_user, multiple_menu_items):
+        """Every row is added at its menu price -> 201"""
+        self.auth(api_client, customer_user)
+        rows = [{'menuitem': item.id, 'quantity': 2} for item in multiple_menu_items]
+
+        response = api_client.post('/api/cart/menu-items', rows, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == len(multiple_menu_items)
+        assert all(row['id'] for row in response.data)
+        for item in multiple_menu_items:
+            cart_item = Cart.objects.get(user=customer_user, menuitem=item)
+            assert cart_item.quantity == 2
+            assert cart_item.price == cart_item.unit_price * 2
+
+    def test_basket_merges_with_cart_and_itself(self, api_client, customer_user, menu_item, create_cart_item):
+        """Existing rows and repeated rows are summed -> 200 when nothing is new"""
+        self.auth(api_client, customer_user)
+        create_cart_item(user=customer_user, menuitem=menu_item, quantity=1)
+
+        response = api_client.post('/api/cart/menu-items', [
+            {'menuitem': menu_item.id, 'quantity': 2},
+            {'menuitem': menu_item.id, 'quantity': 3},
+        ], format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Cart.objects.get(user=customer_user, menuitem=menu_item).quantity == 6
+
+    def test_basket_costs_three_queries(self, api_client, customer_user, create_menu_item):
+        """Menu item lookup, existing rows and one upsert, whatever the basket size"""
+        self.auth(api_client, customer_user)
+        items = [create_menu_item(name=f'Item {i}') for i in range(10)]
+        api_client.get('/api/cart/menu-items')  # warm the role cache
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post(
+                '/api/cart/menu-items', [{'menuitem': item.id, 'quantity': 1} for item in items], format='json'
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        queries = [q['sql'] for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+        auth_queries = [sql for sql in queries if 'authtoken' in sql]
+        assert len(queries) - len(auth_queries) == 3
+
+    def test_concurrent_add_is_not_overwritten(self, customer_user, create_menu_item, monkeypatch):
+        """A row another request adds between the read and the upsert is incremented, not overwritten"""
+        soup = create_menu_item(name='Soup', price=5.10)
+        read_existing = cart._existing_menuitems
+
+        def racing(user, menuitem_ids):
+            existing = read_existing(user, menuitem_ids)
+            cart.add_to_cart(user, soup, 2)  # the other request's add lands here
+            return existing
+
+        monkeypatch.setattr(cart, '_existing_menuitems', racing)
+        rows, _ = cart.add_many_to_cart(customer_user, [(soup, 3)])
+
+        cart_item = Cart.objects.get(user=customer_user, menuitem=soup)
+        assert (cart_item.quantity, cart_item.price) == (5, Decimal('25.50'))
+        assert [(row.quantity, row.price) for row in rows] == [(5, Decimal('25.50'))]
+
+    def test_invalid_rows_are_reported(self, api_client, customer_user, menu_item):
+        """Unknown menu items fail by row index and nothing is added -> 400"""
+        self.auth(api_client, customer_user)
+
+        response = api_client.post('/api/cart/menu-items', [
+            {'menuitem': menu_item.id, 'quantity': 1},
+            {'menuitem': 9999, 'quantity': 1},
+        ], format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'menuitem' in response.data[1]
+        assert not Cart.objects.filter(user=customer_user).exists()
+
+
+@pytest.mark.django_db
+class TestCartSummary:
+    """Tests for GET /api/cart/summary"""
+
+    def auth(self, api_client, user):
+        token = Token.objects.create(user=user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_summary_totals(self, api_client, customer_user, multiple_menu_items, create_cart_item):
+        """Item count, total quantity and total price of the cart"""
+        self.auth(api_client, customer_user)
+        create_cart_item(user=customer_user, menuitem=multiple_menu_items[0], quantity=2, unit_price=10, price=20)
+        create_cart_item(user=customer_user, menuitem=multiple_menu_items[1], quantity=1, unit_price=5.5, price=5.5)
+
+        response = api_client.get('/api/cart/summary')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'items': 2, 'quantity': 3, 'total': '25.50'}
+
+    def test_empty_cart_summary(self, api_client, customer_user):
+        """An empty cart sums to zero"""
+        self.auth(api_client, customer_user)
+
+        response = api_client.get('/api/cart/summary')
+
+        assert response.data == {'items': 0, 'quantity': 0, 'total': '0.00'}
+
+    def test_summary_is_cached(self, api_client, customer_user, menu_item, create_cart_item):
+        """A repeated summary doesn't touch the cart table"""
+        self.auth(api_client, customer_user)
+        create_cart_item(user=customer_user, menuitem=menu_item)
+        api_client.get('/api/cart/summary')
+
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get('/api/cart/summary')
+
+        assert not [q for q in ctx.captured_queries if 'LittleLemonAPI_cart' in q['sql']]
+
+    def test_add_invalidates_summary(self, api_client, customer_user, menu_item):
+        """Adding to the cart updates the summary"""
+        self.auth(api_client, customer_user)
+        api_client.get('/api/cart/summary')
+
+        api_client.post('/api/cart/menu-items', {'menuitem': menu_item.id, 'quantity': 2})
+        response = api_client.get('/api/cart/summary')
+
+        assert (response.data['items'], response.data['quantity']) == (1, 2)
+
+    def test_destroy_and_checkout_invalidate_summary(self, api_client, customer_user, menu_item, create_cart_item):
+        """Emptying the cart or checking out resets the summary"""
+        self.auth(api_client, customer_user)
+        create_cart_item(user=customer_user, menuitem=menu_item)
+        api_client.get('/api/cart/summary')
+        api_client.delete('/api/cart/menu-items')
+        assert api_client.get('/api/cart/summary').data['items'] == 0
+
+        create_cart_item(user=customer_user, menuitem=menu_item)
+        cart.invalidate_summaries([customer_user.pk])  # rows created outside the API
+        assert api_client.get('/api/cart/summary').data['items'] == 1
+        api_client.post('/api/orders')
+        assert api_client.get('/api/cart/summary').data['items'] == 0
+
+    def test_menu_item_delete_invalidates_summary(self, api_client, customer_user, menu_item, create_cart_item):
+        """Carts losing an item through the cascade see it in the summary"""
+        self.auth(api_client, customer_user)
+        create_cart_item(user=customer_user, menuitem=menu_item)
+        api_client.get('/api/cart/summary')
+
+        menu_item.delete()
+
+        assert api_client.get('/api/cart/summary').data['items'] == 0
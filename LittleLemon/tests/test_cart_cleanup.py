@@ -0,0 +1,110 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from LittleLemonAPI import cart
+from LittleLemonAPI.cart import add_to_cart, add_many_to_cart, cart_summary, delete_abandoned_carts
+from LittleLemonAPI.models import Cart
+
+
+def age(cart_items, days):
+    """Moves the cart rows' last change `days` into the past"""
+    Cart.objects.filter(pk__in=[item.pk for item in cart_items]).update(
+        updated=timezone.now() - timedelta(days=days)
+    )
+
+
+@pytest.mark.django_db
+class TestCartCleanup:
+    """Tests for expiring abandoned carts"""
+
+    def test_old_carts_are_deleted(self, create_user, customer_user, multiple_menu_items, create_cart_item):
+        """Carts untouched for longer than the cutoff go, fresh ones stay"""
+        user = create_user('gone')
+        old = [create_cart_item(user=user, menuitem=item) for item in multiple_menu_items]
+        fresh = create_cart_item(user=customer_user, menuitem=multiple_menu_items[0])
+        age(old, days=10)
+
+        deleted, batches = delete_abandoned_carts(timezone.now() - timedelta(days=7))
+
+        assert (deleted, batches) == (3, 1)
+        assert list(Cart.objects.values_list('pk', flat=True)) == [fresh.pk]
+
+    def test_recently_touched_cart_is_kept_whole(self, customer_user, multiple_menu_items, create_cart_item):
+        """One recent row keeps the user's older rows too"""
+        items = [create_cart_item(user=customer_user, menuitem=item) for item in multiple_menu_items]
+        age(items[:-1], days=10)
+
+        deleted, _ = delete_abandoned_carts(timezone.now() - timedelta(days=7))
+
+        assert deleted == 0
+        assert Cart.objects.filter(user=customer_user).count() == len(items)
+
+    def test_deletes_in_small_batches(self, create_user, multiple_menu_items, create_cart_item):
+        """Each batch is its own DELETE of at most batch_size rows"""
+        users = [create_user(f'user{i}') for i in range(3)]
+        items = [create_cart_item(user=user, menuitem=item) for user in users for item in multiple_menu_items]
+        age(items, days=10)
+
+        with CaptureQueriesContext(connection) as ctx:
+            deleted, batches = delete_abandoned_carts(timezone.now() - timedelta(days=7), batch_size=4)
+
+        deletes = [q for q in ctx.captured_queries if q['sql'].startswith('DELETE')]
+        assert (deleted, batches) == (9, 3)
+        assert len(deletes) == 3
+        assert not Cart.objects.exists()
+
+    def test_cart_touched_after_picking_is_kept_whole(self, customer_user, multiple_menu_items, create_cart_item, monkeypatch):
+        """An add between picking a batch and deleting it keeps the user's older rows"""
+        items = [create_cart_item(user=customer_user, menuitem=item) for item in multiple_menu_items[:2]]
+        age(items, days=10)
+        abandoned_carts = cart.abandoned_carts
+        calls = []
+
+        def touched_after_picking(cutoff):
+            calls.append(cutoff)
+            if len(calls) == 2:  # the batch is picked, the delete is next
+                add_to_cart(customer_user, multiple_menu_items[2], 1)
+            return abandoned_carts(cutoff)
+
+        monkeypatch.setattr(cart, 'abandoned_carts', touched_after_picking)
+        deleted, _ = delete_abandoned_carts(timezone.now() - timedelta(days=7))
+
+        assert deleted == 0
+        assert Cart.objects.filter(user=customer_user).count() == 3
+
+    def test_cleanup_invalidates_cart_summary(self, customer_user, menu_item, create_cart_item):
+        """A cached summary doesn't outlive the deleted cart"""
+        age([create_cart_item(user=customer_user, menuitem=menu_item, quantity=2)], days=10)
+        assert cart_summary(customer_user)['quantity'] == 2
+
+        delete_abandoned_carts(timezone.now() - timedelta(days=7))
+
+        assert cart_summary(customer_user)['quantity'] == 0
+
+    def test_merging_touches_cart(self, customer_user, multiple_menu_items, create_cart_item):
+        """The F() and bulk upsert paths bump updated even though save() isn't called"""
+        items = [create_cart_item(user=customer_user, menuitem=item) for item in multiple_menu_items[:2]]
+        age(items, days=10)
+        cutoff = timezone.now() - timedelta(days=1)
+
+        add_to_cart(customer_user, multiple_menu_items[0], 1)
+        add_many_to_cart(customer_user, [(multiple_menu_items[1], 1)])
+
+        assert not Cart.objects.filter(user=customer_user, updated__lt=cutoff).exists()
+
+    def test_command_reports_throughput(self, create_user, multiple_menu_items, create_cart_item):
+        """cleanup_carts prints rows removed, batches and rows per second"""
+        user = create_user('gone')
+        age([create_cart_item(user=user, menuitem=item) for item in multiple_menu_items], days=10)
+        out = io.StringIO()
+
+        call_command('cleanup_carts', '--age', str(60 * 60 * 24 * 7), '--batch-size', '2', stdout=out)
+
+        assert 'Removed 3 abandoned cart rows in 2 batches' in out.getvalue()
+        assert 'rows/s' in out.getvalue()
+        assert not Cart.objects.exists()
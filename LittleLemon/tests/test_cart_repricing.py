@@ -0,0 +1,101 @@
+import io
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.cart import reprice_all_carts, cart_summary
+from LittleLemonAPI.models import Cart, MenuItem
+
+
+@pytest.mark.django_db
+class TestCartRepricing:
+    """Tests for moving carts to new menu prices"""
+
+    def test_price_change_reprices_carts(self, create_user, menu_item, create_cart_item):
+        """Saving a new price updates unit_price and price of every cart holding it"""
+        carts = [create_cart_item(user=create_user(f'user{i}'), menuitem=menu_item, quantity=i + 1) for i in range(3)]
+
+        menu_item.price = Decimal('4.25')
+        menu_item.save()
+
+        for cart_item in carts:
+            cart_item.refresh_from_db()
+            assert cart_item.unit_price == Decimal('4.25')
+            assert cart_item.price == Decimal('4.25') * cart_item.quantity
+
+    def test_reprice_is_one_update(self, create_user, menu_item, create_cart_item):
+        """The rows are fixed by a single set-based UPDATE with a correlated subquery"""
+        for i in range(5):
+            create_cart_item(user=create_user(f'user{i}'), menuitem=menu_item, quantity=2)
+        MenuItem.objects.filter(pk=menu_item.pk).update(price=Decimal('3.00'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            updated = reprice_all_carts()
+
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        assert updated == 5
+        assert len(updates) == 1
+        assert 'SET "unit_price" = (SELECT "U0"."price"' in updates[0]
+
+    def test_manager_update_reprices_carts(self, api_client, manager_user, customer_user, menu_item, create_cart_item):
+        """PATCH /api/menu-items/<id> with a new price reaches open carts"""
+        cart_item = create_cart_item(user=customer_user, menuitem=menu_item, quantity=2)
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.patch(f'/api/menu-items/{menu_item.id}', {'price': '7.00'})
+
+        assert response.status_code == status.HTTP_200_OK
+        cart_item.refresh_from_db()
+        assert cart_item.price == Decimal('14.00')
+
+    def test_bulk_update_reprices_carts(self, api_client, manager_user, customer_user, menu_item, create_cart_item):
+        """The bulk endpoint sends no signals but still reprices"""
+        cart_item = create_cart_item(user=customer_user, menuitem=menu_item, quantity=3)
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        api_client.patch('/api/menu-items', [{'id': menu_item.id, 'price': '2.00'}], format='json')
+
+        cart_item.refresh_from_db()
+        assert cart_item.price == Decimal('6.00')
+
+    def test_bulk_update_without_price_leaves_carts(self, api_client, manager_user, customer_user, menu_item, create_cart_item):
+        """A bulk update that changes no prices doesn't touch carts"""
+        cart_item = create_cart_item(user=customer_user, menuitem=menu_item, quantity=3, unit_price=Decimal('1.00'))
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        api_client.patch('/api/menu-items', [{'id': menu_item.id, 'name': 'Renamed'}], format='json')
+
+        cart_item.refresh_from_db()
+        assert cart_item.unit_price == Decimal('1.00')
+
+    def test_reprice_invalidates_cart_summary(self, customer_user, menu_item, create_cart_item):
+        """Cached summaries of repriced carts are dropped"""
+        create_cart_item(user=customer_user, menuitem=menu_item, quantity=2, unit_price=1, price=2)
+        assert cart_summary(customer_user)['total'] == '2.00'
+
+        menu_item.price = Decimal('5.00')
+        menu_item.save()
+
+        assert cart_summary(customer_user)['total'] == '10.00'
+
+    def test_command_reprices_in_chunks(self, create_user, multiple_menu_items, create_cart_item):
+        """reprice_carts walks the cart table chunk by chunk"""
+        user = create_user('chunky')
+        for item in multiple_menu_items:
+            create_cart_item(user=user, menuitem=item, quantity=1, unit_price=0, price=0)
+        out = io.StringIO()
+
+        with CaptureQueriesContext(connection) as ctx:
+            call_command('reprice_carts', '--chunk-size', '2', stdout=out)
+
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        assert len(updates) == -(-len(multiple_menu_items) // 2)
+        assert f'Repriced {len(multiple_menu_items)} cart rows' in out.getvalue()
+        assert not Cart.objects.filter(price=0).exists()
@@ -0,0 +1,82 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from LittleLemonAPI.models import Category, MenuItem
+
+
+@pytest.fixture
+def categories():
+    mains = Category.objects.create(slug='mains', title='Mains')
+    drinks = Category.objects.create(slug='drinks', title='Drinks')
+    Category.objects.create(slug='empty', title='Empty')
+    MenuItem.objects.create(name='Pasta', price=12.50, category=mains)
+    MenuItem.objects.create(name='Pizza', price=9.00, category=mains)
+    MenuItem.objects.create(name='Water', price=1.00, category=drinks)
+    return mains, drinks
+
+
+@pytest.mark.django_db
+class TestCategoryStats:
+    """Tests for /api/categories?with_stats=true"""
+
+    def test_stats_per_category(self, api_client, categories):
+        """Each category carries its item count and price range"""
+        response = api_client.get('/api/categories?with_stats=true')
+
+        assert response.status_code == status.HTTP_200_OK
+        stats = {row['slug']: (row['item_count'], row['min_price'], row['max_price']) for row in response.data['results']}
+        assert stats == {
+            'mains': (2, '9.00', '12.50'),
+            'drinks': (1, '1.00', '1.00'),
+            'empty': (0, None, None),
+        }
+
+    def test_plain_list_has_no_stats(self, api_client, categories):
+        """Without the flag the response is unchanged"""
+        response = api_client.get('/api/categories')
+
+        assert set(response.data['results'][0]) == {'id', 'slug', 'title'}
+
+    def test_stats_use_one_grouped_query(self, api_client, categories):
+        """The page is one aggregate query plus the version lookup and pagination count"""
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get('/api/categories?with_stats=true')
+
+        assert len(ctx.captured_queries) == 3
+        assert 'GROUP BY' in ctx.captured_queries[-1]['sql']
+
+    def test_stats_are_cached(self, api_client, categories):
+        """A repeated request is served from the cache after only the version lookup"""
+        api_client.get('/api/categories?with_stats=true')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get('/api/categories?with_stats=true')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(ctx.captured_queries) == 1
+        assert 'catalogversion' in ctx.captured_queries[0]['sql']
+
+    def test_stats_support_conditional_get_and_fields(self, api_client, categories):
+        """Cached stats pages still honour If-None-Match and ?fields="""
+        url = '/api/categories?with_stats=true&fields=slug,item_count'
+        first = api_client.get(url)
+        cached = api_client.get(url)
+
+        revalidated = api_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert set(first.data['results'][0]) == {'slug', 'item_count'}
+        assert cached.data == first.data
+        assert cached['ETag'] == first['ETag']
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_menu_item_write_invalidates_stats(self, api_client, categories):
+        """Adding an item shows up in the next stats response"""
+        mains, _ = categories
+        api_client.get('/api/categories?with_stats=true')
+
+        MenuItem.objects.create(name='Lasagne', price=15.00, category=mains)
+        response = api_client.get('/api/categories?with_stats=true')
+
+        row = next(row for row in response.data['results'] if row['slug'] == 'mains')
+        assert (row['item_count'], row['max_price']) == (3, '15.00')
@@ -0,0 +1,67 @@
+import datetime
+
+import pytest
+from unittest import mock
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.checkout import checkout, EmptyCartError
+from LittleLemonAPI.models import Cart, Order, OrderItem, DailySales
+
+
+@pytest.mark.django_db
+class TestCheckout:
+    """Tests for the single-transaction checkout pipeline"""
+
+    def test_checkout_copies_cart_into_order(self, customer_user, customer_cart_multiple_items):
+        """Checkout creates the order with its items and total and empties the cart"""
+        expected_total = sum(item.price for item in customer_cart_multiple_items)
+
+        result = checkout(customer_user)
+
+        assert result.order.order_items.count() == 3
+        assert not Cart.objects.filter(user=customer_user).exists()
+        assert float(Order.objects.get(id=result.order.id).total) == float(expected_total)
+
+    def test_checkout_empty_cart_raises(self, customer_user):
+        """Checkout of an empty cart raises EmptyCartError and creates no order"""
+        with pytest.raises(EmptyCartError):
+            checkout(customer_user)
+
+        assert Order.objects.count() == 0
+
+    def test_checkout_query_count_does_not_grow_with_cart(self, customer_user, create_user, create_menu_item, create_cart_item):
+        """The number of queries per checkout is constant regardless of cart size"""
+        other_customer = create_user(username='othercustomer', groups=['customers'])
+        items = [create_menu_item(name=f'Item {i}', price=5 + i) for i in range(12)]
+        create_cart_item(user=customer_user, menuitem=items[0])
+        for item in items:
+            create_cart_item(user=other_customer, menuitem=item)
+
+        # The first checkout of the day also creates the day's sales row
+        DailySales.objects.create(date=datetime.date.today())
+
+        small = checkout(customer_user)
+        large = checkout(other_customer)
+
+        assert large.query_count == small.query_count
+        assert OrderItem.objects.filter(order=large.order).count() == 12
+
+    def test_checkout_failure_rolls_back(self, customer_user, customer_cart_multiple_items):
+        """A failure while writing order items leaves the cart and orders untouched"""
+        with mock.patch.object(OrderItem.objects, 'bulk_create', side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                checkout(customer_user)
+
+        assert Order.objects.count() == 0
+        assert Cart.objects.filter(user=customer_user).count() == 3
+
+    def test_order_endpoint_reports_query_count(self, api_client, customer_user, customer_cart):
+        """POST /api/orders reports the checkout query cost in X-Checkout-Queries"""
+        token = Token.objects.create(user=customer_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.post('/api/orders', {})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert int(response['X-Checkout-Queries']) > 0
+        assert len(response.data['order_items']) == 1
@@ -0,0 +1,118 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.models import DailySales, Order
+
+
+def today():
+    return DailySales.objects.get(date=datetime.date.today())
+
+
+@pytest.mark.django_db
+class TestDailySales:
+    """Tests for incrementally maintained daily sales aggregates"""
+
+    def authenticate(self, api_client, user):
+        token = Token.objects.create(user=user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_checkout_adds_order_and_revenue(self, api_client, customer_user, customer_cart_multiple_items):
+        """POST /api/orders increments the day's order count and revenue"""
+        self.authenticate(api_client, customer_user)
+
+        response = api_client.post('/api/orders', {})
+
+        row = today()
+        assert row.order_count == 1
+        assert row.revenue == Decimal(response.data['total'])
+        assert row.delivered_count == 0
+
+    def test_status_and_total_changes_are_tracked(self, api_client, manager_user, customer_user, customer_cart):
+        """PATCH updates delivered count and revenue by the difference"""
+        self.authenticate(api_client, customer_user)
+        order_id = api_client.post('/api/orders', {}).data['id']
+
+        api_client.credentials()
+        self.authenticate(api_client, manager_user)
+        api_client.patch(f'/api/orders/{order_id}', {'status': True, 'total': '40.00'}, format='json')
+
+        row = today()
+        assert row.order_count == 1
+        assert row.revenue == Decimal('40.00')
+        assert row.delivered_count == 1
+
+    def test_bulk_status_updates_delivered_count(self, api_client, manager_user, customer_user, customer_cart):
+        """PATCH /api/orders/status only counts orders whose status actually changes"""
+        self.authenticate(api_client, customer_user)
+        order_id = api_client.post('/api/orders', {}).data['id']
+
+        api_client.credentials()
+        self.authenticate(api_client, manager_user)
+        api_client.patch('/api/orders/status', {'orders': [order_id], 'status': True}, format='json')
+        api_client.patch('/api/orders/status', {'orders': [order_id], 'status': True}, format='json')
+
+        assert today().delivered_count == 1
+
+    def test_destroy_removes_order(self, api_client, manager_user, customer_user, customer_cart):
+        """DELETE subtracts the order from the day's aggregate"""
+        self.authenticate(api_client, customer_user)
+        order_id = api_client.post('/api/orders', {}).data['id']
+
+        api_client.credentials()
+        self.authenticate(api_client, manager_user)
+        api_client.delete(f'/api/orders/{order_id}')
+
+        row = today()
+        assert row.order_count == 0
+        assert row.revenue == 0
+
+    def test_rebuild_recomputes_from_orders(self, customer_user, create_order):
+        """rebuild_daily_sales recomputes every day from Order across chunks"""
+        for day, total, delivered in [(1, 10, False), (1, 5, True), (20, 7, False), (70, 3, True)]:
+            order = create_order(user=customer_user, total=total, status=delivered)
+            Order.objects.filter(id=order.id).update(date=datetime.date(2026, 1, 1) + datetime.timedelta(days=day))
+        DailySales.objects.create(date=datetime.date(2020, 1, 1), order_count=99)
+        out = StringIO()
+
+        call_command('rebuild_daily_sales', '--chunk-days', '7', stdout=out)
+
+        rows = list(DailySales.objects.values_list('date', 'order_count', 'revenue', 'delivered_count'))
+        assert rows == [
+            (datetime.date(2026, 1, 2), 2, Decimal('15.00'), 1),
+            (datetime.date(2026, 1, 21), 1, Decimal('7.00'), 0),
+            (datetime.date(2026, 3, 12), 1, Decimal('3.00'), 1),
+        ]
+        assert 'Rebuilt 3 days' in out.getvalue()
+
+    def test_report_endpoint_filters_by_date_range(self, api_client, manager_user):
+        """GET /api/reports/daily-sales returns the days in range with totals"""
+        for day in range(1, 6):
+            DailySales.objects.create(date=datetime.date(2026, 1, day), order_count=day, revenue=day * 10, delivered_count=1)
+        self.authenticate(api_client, manager_user)
+
+        response = api_client.get('/api/reports/daily-sales?start=2026-01-02&end=2026-01-04')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['date'] for row in response.data['days']] == ['2026-01-02', '2026-01-03', '2026-01-04']
+        assert response.data['totals'] == {'order_count': 9, 'revenue': '90.00', 'delivered_count': 3}
+
+    def test_report_endpoint_rejects_bad_dates(self, api_client, manager_user):
+        """Malformed dates return 400"""
+        self.authenticate(api_client, manager_user)
+
+        response = api_client.get('/api/reports/daily-sales?start=yesterday')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_report_endpoint_is_manager_only(self, api_client, customer_user):
+        """Customers cannot read sales reports"""
+        self.authenticate(api_client, customer_user)
+
+        response = api_client.get('/api/reports/daily-sales')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
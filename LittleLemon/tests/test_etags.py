@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from LittleLemonAPI.models import Category, MenuItem
+
+
+@pytest.mark.django_db
+class TestCatalogETags:
+    """Test suite for conditional GET on menu items and categories"""
+
+    def test_list_returns_etag(self, api_client, multiple_menu_items):
+        """GET /api/menu-items returns a strong ETag"""
+        response = api_client.get('/api/menu-items')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'].startswith('"')
+
+    def test_matching_etag_returns_304_without_queries(self, api_client, multiple_menu_items):
+        """If-None-Match with the current ETag returns 304 after only the version lookup"""
+        etag = api_client.get('/api/menu-items')['ETag']
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get('/api/menu-items', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert len(ctx.captured_queries) == 1
+        assert 'catalogversion' in ctx.captured_queries[0]['sql']
+
+    def test_etag_depends_on_query_string(self, api_client, multiple_menu_items):
+        """Different filters or pages get different ETags"""
+        plain = api_client.get('/api/menu-items')['ETag']
+        ordered = api_client.get('/api/menu-items?ordering=price')['ETag']
+
+        assert plain != ordered
+
+    def test_menu_item_change_invalidates_etag(self, api_client, manager_user, menu_item):
+        """Editing a menu item through the API changes the ETag"""
+        etag = api_client.get('/api/menu-items')['ETag']
+        api_client.force_authenticate(user=manager_user)
+        api_client.patch(f'/api/menu-items/{menu_item.id}', {'price': '99.00'})
+        api_client.force_authenticate(user=None)
+
+        response = api_client.get('/api/menu-items', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0]['price'] == '99.00'
+
+    def test_write_on_another_worker_invalidates_etag(self, api_client, settings, menu_item):
+        """Workers don't share a local-memory cache, but they do share the version"""
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-a'}}
+        etag = api_client.get('/api/menu-items')['ETag']
+
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-b'}}
+        menu_item.price = 99
+        menu_item.save()
+
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-a'}}
+        response = api_client.get('/api/menu-items', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0]['price'] == '99.00'
+
+    def test_category_change_invalidates_etag(self, api_client):
+        """Saving or deleting a category changes the categories ETag"""
+        category = Category.objects.create(slug='mains', title='Mains')
+        etag = api_client.get('/api/categories')['ETag']
+        category.delete()
+
+        response = api_client.get('/api/categories', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == []
+
+    def test_retrieve_supports_conditional_get(self, api_client, menu_item):
+        """GET /api/menu-items/{id} honours If-None-Match too"""
+        etag = api_client.get(f'/api/menu-items/{menu_item.id}')['ETag']
+
+        response = api_client.get(f'/api/menu-items/{menu_item.id}', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_missing_item_has_no_etag(self, api_client):
+        """404 responses are not tagged"""
+        response = api_client.get('/api/menu-items/999')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not response.has_header('ETag')
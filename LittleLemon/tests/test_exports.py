@@ -0,0 +1,90 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.exports import stream_ndjson
+from LittleLemonAPI.models import Order
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestOrderExport:
+    """Tests for GET /api/orders/export"""
+
+    def authenticate(self, api_client, user):
+        token = Token.objects.create(user=user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_csv_export_has_one_line_per_item(self, api_client, manager_user, customer_order_with_items, customer_order):
+        """CSV has a line per order item and a line for orders without items"""
+        self.authenticate(api_client, manager_user)
+
+        response = api_client.get('/api/orders/export')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/csv'
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert len(rows) == 4
+        assert [row['order_id'] for row in rows].count(str(customer_order_with_items.id)) == 3
+        empty = [row for row in rows if row['order_id'] == str(customer_order.id)]
+        assert empty[0]['menuitem'] == ''
+
+    def test_ndjson_export_matches_serializer(self, api_client, manager_user, customer_order_with_items):
+        """NDJSON lines have the same shape as GET /api/orders/{id}"""
+        self.authenticate(api_client, manager_user)
+        detail = api_client.get(f'/api/orders/{customer_order_with_items.id}').data
+
+        response = api_client.get('/api/orders/export?output=ndjson')
+
+        lines = content(response).splitlines()
+        assert json.loads(lines[0]) == json.loads(json.dumps(detail))
+
+    def test_export_filters_by_status_and_date(self, api_client, manager_user, customer_user, create_order):
+        """start, end and status narrow the export"""
+        old = create_order(user=customer_user, status=True)
+        Order.objects.filter(id=old.id).update(date=datetime.date(2025, 1, 1))
+        delivered = create_order(user=customer_user, status=True)
+        create_order(user=customer_user, status=False)
+        self.authenticate(api_client, manager_user)
+
+        response = api_client.get(f'/api/orders/export?output=ndjson&status=1&start={datetime.date.today()}')
+
+        ids = [json.loads(line)['id'] for line in content(response).splitlines()]
+        assert ids == [delivered.id]
+
+    def test_items_are_fetched_per_chunk(self, customer_user, create_order, create_order_item, menu_item):
+        """Order items cost one query per chunk of orders, not one per order"""
+        for _ in range(10):
+            create_order_item(order=create_order(user=customer_user), menuitem=menu_item)
+
+        with CaptureQueriesContext(connection) as ctx:
+            lines = list(stream_ndjson(Order.objects.all(), chunk_size=5))
+
+        assert len(lines) == 10
+        # one streamed orders query plus one order_items query per chunk
+        assert len(ctx.captured_queries) == 3
+
+    def test_invalid_output_is_rejected(self, api_client, manager_user):
+        """Unknown output formats return 400"""
+        self.authenticate(api_client, manager_user)
+
+        response = api_client.get('/api/orders/export?output=xlsx')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_is_manager_only(self, api_client, delivery_user):
+        """Delivery crew cannot export orders"""
+        self.authenticate(api_client, delivery_user)
+
+        response = api_client.get('/api/orders/export')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from LittleLemonAPI import featured
+from LittleLemonAPI.catalog import catalog_version
+from LittleLemonAPI.models import MenuItem
+
+
+@pytest.fixture
+def featured_menu(db):
+    return [
+        MenuItem.objects.create(name='Special', price=20.00, featured=True),
+        MenuItem.objects.create(name='Soup', price=5.00, featured=True),
+        MenuItem.objects.create(name='Bread', price=2.00),
+    ]
+
+
+@pytest.mark.django_db
+class TestFeaturedItems:
+    """Tests for /api/menu-items/featured and its cache"""
+
+    def test_lists_featured_items_by_price(self, api_client, featured_menu):
+        """Only featured items are returned, cheapest first"""
+        response = api_client.get('/api/menu-items/featured')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['name'] for row in response.data] == ['Soup', 'Special']
+        assert response.data[0]['price'] == '5.00'
+
+    def test_served_from_memory(self, api_client, featured_menu):
+        """Repeated reads only look up the catalog version"""
+        api_client.get('/api/menu-items/featured')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get('/api/menu-items/featured')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(ctx.captured_queries) == 1
+        assert 'catalogversion' in ctx.captured_queries[0]['sql']
+
+    def test_save_invalidates(self, api_client, featured_menu):
+        """Featuring another item shows up on the next read"""
+        api_client.get('/api/menu-items/featured')
+        bread = featured_menu[2]
+        bread.featured = True
+        bread.save()
+
+        response = api_client.get('/api/menu-items/featured')
+
+        assert [row['name'] for row in response.data] == ['Bread', 'Soup', 'Special']
+
+    def test_delete_invalidates(self, api_client, featured_menu):
+        """Deleting a featured item drops it from the list"""
+        api_client.get('/api/menu-items/featured')
+        featured_menu[0].delete()
+
+        response = api_client.get('/api/menu-items/featured')
+
+        assert [row['name'] for row in response.data] == ['Soup']
+
+    def test_rebuild_in_progress_serves_stale_copy(self, featured_menu):
+        """After the TTL runs out, a worker that loses the rebuild race keeps serving its copy"""
+        version = catalog_version()
+        first = featured.featured_items(version)
+        featured._local.clear()  # TTL expired
+        cache.delete(featured.SHARED_KEY.format(version=version))
+        cache.add(featured.REBUILD_KEY.format(version=version), True)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert featured.featured_items(version) == first
+
+        assert len(ctx.captured_queries) == 0
+
+    def test_waits_for_the_rebuilding_worker(self, featured_menu):
+        """Without a usable copy, losers wait for the winner's shared result"""
+        version = catalog_version()
+        cache.add(featured.REBUILD_KEY.format(version=version), True)
+        shared = [{'id': 0, 'name': 'From another worker', 'price': '1.00'}]
+        timer = threading.Timer(0.1, cache.set, [featured.SHARED_KEY.format(version=version), shared])
+        timer.start()
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = featured.featured_items(version)
+        timer.join()
+
+        assert data == shared
+        assert len(ctx.captured_queries) == 0
+
+    def test_only_one_thread_rebuilds(self, featured_menu, monkeypatch):
+        """Concurrent misses in one process render the list once"""
+        calls = []
+
+        def counting_render():
+            # other threads have no test database, so don't query here
+            calls.append(1)
+            time.sleep(0.05)
+            return []
+
+        monkeypatch.setattr(featured, '_render', counting_render)
+        version = catalog_version()
+        threads = [threading.Thread(target=featured.featured_items, args=[version]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
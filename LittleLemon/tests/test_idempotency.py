@@ -0,0 +1,117 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI import idempotency
+from LittleLemonAPI.models import Cart, Order, IdempotencyKey
+
+
+@pytest.mark.django_db
+class TestOrderIdempotency:
+    """Tests for Idempotency-Key replay on POST /api/orders"""
+
+    def authenticate(self, api_client, user):
+        token = Token.objects.create(user=user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_retry_replays_first_response(self, api_client, customer_user, customer_cart_multiple_items):
+        """A retry with the same key returns the first order instead of a 400"""
+        self.authenticate(api_client, customer_user)
+
+        first = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+        retry = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.data == first.data
+        assert retry['Idempotent-Replayed'] == 'true'
+        assert Order.objects.filter(user=customer_user).count() == 1
+
+    def test_concurrent_retry_replays_after_cart_was_emptied(self, api_client, customer_user, customer_cart, monkeypatch):
+        """A retry that passed the key check before the first request committed replays instead of a 400"""
+        self.authenticate(api_client, customer_user)
+        first = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+        idempotency.clear_cache()
+        lookup = idempotency.lookup
+        calls = []
+
+        def lookup_before_commit(user, key):
+            calls.append(key)
+            # the first check ran while the first request still held the cart
+            return None if len(calls) == 1 else lookup(user, key)
+
+        monkeypatch.setattr(idempotency, 'lookup', lookup_before_commit)
+        retry = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+
+        assert not Cart.objects.filter(user=customer_user).exists()
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.data == first.data
+        assert retry['Idempotent-Replayed'] == 'true'
+
+    def test_replay_does_not_touch_order_tables(self, api_client, customer_user, customer_cart):
+        """A replay reads neither cart, order nor order item tables"""
+        self.authenticate(api_client, customer_user)
+        api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+
+        tables = ('littlelemonapi_cart', 'littlelemonapi_order')
+        assert not [q for q in ctx.captured_queries if any(t in q['sql'].lower() for t in tables)]
+
+    def test_different_key_creates_new_order(self, api_client, customer_user, customer_cart, menu_item, create_cart_item):
+        """A new key is a new checkout"""
+        self.authenticate(api_client, customer_user)
+        api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='first')
+        create_cart_item(user=customer_user, menuitem=menu_item)
+
+        response = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='second')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Order.objects.filter(user=customer_user).count() == 2
+
+    def test_keys_are_scoped_per_user(self, api_client, customer_user, customer_cart, create_user, menu_item, create_cart_item):
+        """The same key used by another user does not replay someone else's order"""
+        other = create_user(username='othercustomer', groups=['customers'])
+        create_cart_item(user=other, menuitem=menu_item)
+        self.authenticate(api_client, customer_user)
+        api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='shared')
+
+        api_client.credentials()
+        self.authenticate(api_client, other)
+        response = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='shared')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['user'] == other.id
+
+    def test_failed_checkout_is_not_stored(self, api_client, customer_user):
+        """An empty cart 400 is not recorded, so a later retry can still succeed"""
+        self.authenticate(api_client, customer_user)
+
+        response = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not IdempotencyKey.objects.exists()
+
+    def test_expired_key_is_not_replayed(self, api_client, customer_user, customer_cart, menu_item, create_cart_item, settings):
+        """Keys older than IDEMPOTENCY_KEY_TTL start a new checkout"""
+        self.authenticate(api_client, customer_user)
+        api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+        create_cart_item(user=customer_user, menuitem=menu_item)
+        settings.IDEMPOTENCY_KEY_TTL = -1
+
+        response = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='abc-123')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Order.objects.filter(user=customer_user).count() == 2
+        assert IdempotencyKey.objects.count() == 1
+
+    def test_overlong_key_is_rejected(self, api_client, customer_user, customer_cart):
+        """Keys longer than 255 characters are rejected with 400"""
+        self.authenticate(api_client, customer_user)
+
+        response = api_client.post('/api/orders', {}, HTTP_IDEMPOTENCY_KEY='x' * 256)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Cart.objects.filter(user=customer_user).exists()
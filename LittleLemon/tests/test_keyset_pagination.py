@@ -0,0 +1,118 @@
+import base64
+import datetime
+import json
+
+import pytest
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.models import MenuItem, Order
+
+
+def walk(api_client, url):
+    """Follows next links and returns every page's results"""
+    pages = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.data['results'])
+        url = response.data['next']
+    return pages
+
+
+@pytest.mark.django_db
+class TestMenuItemKeysetPagination:
+    """Test suite for cursor pagination of menu items"""
+
+    def test_cursor_pages_cover_all_items(self, api_client):
+        """?cursor= walks every menu item exactly once in id order"""
+        for i in range(25):
+            MenuItem.objects.create(name=f"Item {i}", price=10.00 + i)
+
+        pages = walk(api_client, "/api/menu-items?cursor=")
+
+        ids = [item['id'] for page in pages for item in page]
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert ids == sorted(MenuItem.objects.values_list('id', flat=True))
+
+    def test_cursor_response_has_no_count(self, api_client):
+        """Cursor pages return next/previous/results without a COUNT"""
+        MenuItem.objects.create(name="Item", price=10.00)
+
+        response = api_client.get("/api/menu-items?cursor=")
+
+        assert set(response.data.keys()) == {'next', 'previous', 'results'}
+        assert response.data['previous'] is None
+
+    def test_page_numbers_are_kept_without_cursor(self, api_client):
+        """Clients that don't send ?cursor= keep the page-number response shape"""
+        for i in range(12):
+            MenuItem.objects.create(name=f"Item {i}", price=10.00 + i)
+
+        response = api_client.get("/api/menu-items?page=2")
+
+        assert response.data['count'] == 12
+        assert len(response.data['results']) == 2
+
+    def test_previous_link_returns_previous_page(self, api_client):
+        """The previous link of the second page returns the first page"""
+        for i in range(15):
+            MenuItem.objects.create(name=f"Item {i}", price=10.00 + i)
+        first = api_client.get("/api/menu-items?cursor=")
+        second = api_client.get(first.data['next'])
+
+        back = api_client.get(second.data['previous'])
+
+        assert back.data['results'] == first.data['results']
+        assert back.data['previous'] is None
+
+    def test_cursor_follows_price_ordering(self, api_client):
+        """Cursor pages honour ?ordering=price with ties broken by id"""
+        for i in range(14):
+            MenuItem.objects.create(name=f"Item {i}", price=5.00 + i % 3)
+
+        pages = walk(api_client, "/api/menu-items?ordering=price&cursor=")
+
+        rows = [(float(item['price']), item['id']) for page in pages for item in page]
+        assert rows == sorted(rows)
+        assert len(rows) == 14
+
+    def test_invalid_cursor_returns_404(self, api_client):
+        """A malformed cursor returns 404"""
+        response = api_client.get("/api/menu-items?cursor=not-a-cursor")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize('position', [['abc'], [{'x': 1}], [None], [[1]]])
+    def test_cursor_with_wrong_value_types_returns_404(self, api_client, position):
+        """A well-formed cursor whose values don't fit the ordering fields returns 404"""
+        MenuItem.objects.create(name="Soup", price=4.00)
+        cursor = base64.urlsafe_b64encode(json.dumps({'p': position}).encode()).decode()
+
+        response = api_client.get(f"/api/menu-items?cursor={cursor}")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestOrderKeysetPagination:
+    """Test suite for cursor pagination of orders"""
+
+    def test_cursor_follows_order_ordering(self, api_client, manager_user, customer_user, create_order):
+        """Orders are paged by (-date, id) across days with the same date"""
+        for i in range(23):
+            order = create_order(user=customer_user, total=i)
+            Order.objects.filter(id=order.id).update(date=datetime.date(2026, 1, 1 + i % 4))
+
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        pages = walk(api_client, "/api/orders?cursor=")
+
+        ids = [order['id'] for page in pages for order in page]
+        assert ids == list(Order.objects.values_list('id', flat=True))
+        assert len(pages) == 3
+
+    def test_order_ordering_uses_index(self):
+        """The (-date, id) ordering is served by the matching index"""
+        plan = Order.objects.order_by('-date', 'id')[:10].explain()
+
+        assert 'order_date_id_idx' in plan
@@ -0,0 +1,139 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.models import MenuItem, Category
+
+
+@pytest.fixture
+def manager_client(api_client, manager_user):
+    token = Token.objects.create(user=manager_user)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return api_client
+
+
+@pytest.mark.django_db
+class TestMenuItemsBulk:
+    """Tests for list payloads on /api/menu-items"""
+
+    def test_bulk_create(self, manager_client, test_category):
+        """A list payload creates every row, with category and featured"""
+        response = manager_client.post('/api/menu-items', [
+            {'name': 'Soup', 'price': '4.50', 'category': test_category.id, 'featured': True},
+            {'name': 'Bread', 'price': '2.00'},
+        ], format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [row['name'] for row in response.data] == ['Soup', 'Bread']
+        soup = MenuItem.objects.get(name='Soup')
+        assert soup.category == test_category and soup.featured
+        assert MenuItem.objects.get(name='Bread').category is None
+
+    def test_bulk_create_resolves_categories_in_one_query(self, manager_client):
+        """Validation looks all categories up at once"""
+        categories = [Category.objects.create(slug=f'c{i}', title=f'C {i}') for i in range(5)]
+        rows = [{'name': f'Item {i}', 'price': '1.00', 'category': c.id} for i, c in enumerate(categories)]
+        manager_client.get('/api/menu-items')  # warm the role cache
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = manager_client.post('/api/menu-items', rows, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        category_queries = [q for q in ctx.captured_queries if 'FROM "LittleLemonAPI_category"' in q['sql']]
+        assert len(category_queries) == 1
+
+    def test_bulk_create_reports_errors_per_row(self, manager_client):
+        """Invalid rows are reported by index and nothing is written"""
+        response = manager_client.post('/api/menu-items', [
+            {'name': 'Fine', 'price': '1.00'},
+            {'name': 'No price'},
+            {'name': 'Bad category', 'price': '1.00', 'category': 9999},
+        ], format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) == {1, 2}
+        assert 'price' in response.data[1]
+        assert 'category' in response.data[2]
+        assert not MenuItem.objects.exists()
+
+    def test_bulk_partial_update(self, manager_client, multiple_menu_items):
+        """PATCH with a list updates the given fields of each row"""
+        first, second = multiple_menu_items[:2]
+
+        response = manager_client.patch('/api/menu-items', [
+            {'id': first.id, 'price': '9.99'},
+            {'id': second.id, 'featured': True},
+        ], format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert str(first.price) == '9.99'
+        assert second.featured
+
+    def test_bulk_update_unknown_id(self, manager_client, menu_item):
+        """Rows without a matching id fail and roll the batch back"""
+        response = manager_client.put('/api/menu-items', [
+            {'id': menu_item.id, 'name': 'Renamed', 'price': '1.00'},
+            {'id': 9999, 'name': 'Ghost', 'price': '1.00'},
+        ], format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'id' in response.data[1]
+        menu_item.refresh_from_db()
+        assert menu_item.name != 'Renamed'
+
+    def test_bulk_update_reindexes_search(self, manager_client, menu_item):
+        """bulk_update sends no signals, so the view refreshes the search index itself"""
+        manager_client.patch('/api/menu-items', [{'id': menu_item.id, 'name': 'Zucchini fritters'}], format='json')
+
+        response = manager_client.get('/api/menu-items?search=zucchini')
+
+        assert [row['id'] for row in response.data['results']] == [menu_item.id]
+
+    def test_bulk_destroy(self, manager_client, multiple_menu_items):
+        """DELETE with ids removes the items and reports missing ones"""
+        ids = [item.id for item in multiple_menu_items[:2]]
+
+        response = manager_client.delete('/api/menu-items', {'ids': ids + [9999]}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['result'] for row in response.data['results']] == ['deleted', 'deleted', 'not_found']
+        assert not MenuItem.objects.filter(id__in=ids).exists()
+
+    def test_bulk_destroy_query_count_does_not_grow(self, manager_client, customer_user, create_cart_item):
+        """Signal work (version bump, FTS delete, cart summaries) runs once per request, not per row"""
+        def deleted_with_carts(count):
+            items = MenuItem.objects.bulk_create(MenuItem(name=f'Item {i}', price=1) for i in range(count))
+            for item in items:
+                create_cart_item(user=customer_user, menuitem=item)
+            with CaptureQueriesContext(connection) as ctx:
+                response = manager_client.delete('/api/menu-items', {'ids': [item.id for item in items]}, format='json')
+            assert response.status_code == status.HTTP_200_OK
+            return len([q for q in ctx.captured_queries if 'auth' not in q['sql']])
+
+        assert deleted_with_carts(2) == deleted_with_carts(20)
+
+    def test_bulk_destroy_unindexes_items(self, manager_client, menu_item):
+        """Deleted items drop out of search"""
+        manager_client.delete('/api/menu-items', {'ids': [menu_item.id]}, format='json')
+
+        response = manager_client.get(f'/api/menu-items?search={menu_item.name}')
+
+        assert response.data['results'] == []
+
+    def test_bulk_payload_size_is_limited(self, manager_client):
+        """Empty or oversized batches are rejected"""
+        assert manager_client.post('/api/menu-items', [], format='json').status_code == status.HTTP_400_BAD_REQUEST
+        rows = [{'name': 'x', 'price': '1.00'}] * 501
+        assert manager_client.post('/api/menu-items', rows, format='json').status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_customer_cannot_bulk_write(self, api_client, customer_user, menu_item):
+        """Bulk writes need the manager role"""
+        token = Token.objects.create(user=customer_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.delete('/api/menu-items', {'ids': [menu_item.id]}, format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
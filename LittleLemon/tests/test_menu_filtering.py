@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from LittleLemonAPI.models import Category, MenuItem
 
@@ -171,3 +173,102 @@ class TestMenuItemPagination:
         # Verify ordering is maintained
         prices = [float(item['price']) for item in response.data['results']]
         assert prices == sorted(prices, reverse=True)
+
+
+@pytest.mark.django_db
+class TestMenuItemPriceFiltering:
+    """Test suite for price range, featured and multi-category filters"""
+
+    def test_filter_by_price_range(self, api_client):
+        """price_min and price_max bound the price inclusively"""
+        MenuItem.objects.create(name="Cheap", price=4.99)
+        MenuItem.objects.create(name="Medium", price=10.00)
+        MenuItem.objects.create(name="Expensive", price=25.00)
+
+        response = api_client.get("/api/menu-items?price_min=5&price_max=25")
+
+        assert [item['name'] for item in response.data['results']] == ['Medium', 'Expensive']
+
+    def test_filter_by_featured(self, api_client):
+        """featured=true returns only featured items"""
+        MenuItem.objects.create(name="Special", price=12.00, featured=True)
+        MenuItem.objects.create(name="Regular", price=10.00)
+
+        response = api_client.get("/api/menu-items?featured=true")
+
+        assert [item['name'] for item in response.data['results']] == ['Special']
+
+    def test_filter_by_multiple_categories(self, api_client):
+        """categories accepts a comma separated list of ids"""
+        appetizers = Category.objects.create(slug="appetizers", title="Appetizers")
+        mains = Category.objects.create(slug="mains", title="Main Courses")
+        desserts = Category.objects.create(slug="desserts", title="Desserts")
+        MenuItem.objects.create(name="Spring Rolls", price=8.99, category=appetizers)
+        MenuItem.objects.create(name="Steak", price=25.99, category=mains)
+        MenuItem.objects.create(name="Cake", price=5.99, category=desserts)
+
+        response = api_client.get(f"/api/menu-items?categories={appetizers.id},{desserts.id}&ordering=price")
+
+        assert [item['name'] for item in response.data['results']] == ['Cake', 'Spring Rolls']
+
+    def test_invalid_price_is_rejected(self, api_client):
+        """Non-numeric prices return 400"""
+        response = api_client.get("/api/menu-items?price_min=cheap")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestMenuItemFilterQueryPlans:
+    """Benchmarks the query plans: filters must be index range scans, not table scans"""
+
+    def plan(self, queryset):
+        return queryset.explain()
+
+    def endpoint_plan(self, api_client, url):
+        """EXPLAIN QUERY PLAN of the menu item list query the endpoint runs"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        sql = next(
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT "LittleLemonAPI_menuitem"."id"') and 'LIMIT' in q['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+
+    def test_price_range_uses_price_index(self):
+        """price range with price ordering reads the (price, id) index"""
+        plan = self.plan(MenuItem.objects.filter(price__gte=5, price__lte=20).order_by('price', 'id'))
+
+        assert 'USING INDEX menuitem_price_id_idx (price>? AND price<?)' in plan
+
+    def test_category_price_uses_composite_index(self):
+        """category plus price bound reads (category, price) without sorting"""
+        plan = self.plan(MenuItem.objects.filter(category=1, price__gte=5).order_by('price'))
+
+        assert 'USING INDEX menuitem_category_price_idx (category_id=? AND price>?)' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_featured_price_uses_composite_index(self):
+        """featured plus price bound reads (featured, price) without sorting"""
+        plan = self.plan(MenuItem.objects.filter(featured=True, price__lte=20).order_by('price'))
+
+        assert 'USING INDEX menuitem_featured_price_idx (featured=? AND price<?)' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_endpoint_query_uses_price_index(self, api_client, multiple_menu_items):
+        """The query GET /api/menu-items actually runs for a price filter is an index range scan"""
+        plan = self.endpoint_plan(api_client, '/api/menu-items?price_min=5&price_max=20&ordering=price')
+
+        assert 'USING INDEX menuitem_price_id_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_endpoint_query_uses_category_index(self, api_client, multiple_menu_items):
+        """Filtering by category through the endpoint reads the (category, price) index"""
+        category_id = multiple_menu_items[1].category_id
+        plan = self.endpoint_plan(api_client, f'/api/menu-items?category={category_id}&price_min=1&ordering=price')
+
+        assert 'USING INDEX menuitem_category_price_idx' in plan
+        assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,85 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from LittleLemonAPI import snapshot
+from LittleLemonAPI.models import Category, MenuItem
+
+
+@pytest.fixture
+def menu(db):
+    mains = Category.objects.create(slug='mains', title='Mains')
+    drinks = Category.objects.create(slug='drinks', title='Drinks')
+    Category.objects.create(slug='empty', title='Empty')
+    MenuItem.objects.create(name='Water', price=1.00, category=drinks)
+    MenuItem.objects.create(name='Pasta', price=12.50, category=mains)
+    MenuItem.objects.create(name='Pizza', price=9.00, category=mains)
+    MenuItem.objects.create(name='Mystery', price=3.00)
+    return mains, drinks
+
+
+@pytest.mark.django_db
+class TestGroupedMenu:
+    """Tests for GET /api/menu"""
+
+    def test_menu_grouped_by_category(self, api_client, menu):
+        """Items are nested under their category; empty categories are left out"""
+        mains, drinks = menu
+
+        response = api_client.get('/api/menu')
+
+        assert response.status_code == status.HTTP_200_OK
+        groups = response.data['categories']
+        assert [(g['slug'], [i['name'] for i in g['menu_items']]) for g in groups] == [
+            ('mains', ['Pasta', 'Pizza']),
+            ('drinks', ['Water']),
+        ]
+        assert groups[0]['menu_items'][0] == {'id': groups[0]['menu_items'][0]['id'], 'name': 'Pasta', 'price': '12.50'}
+        assert [i['name'] for i in response.data['uncategorized']] == ['Mystery']
+
+    def test_menu_is_built_with_one_query(self, menu):
+        """build_menu joins categories instead of querying per group"""
+        with CaptureQueriesContext(connection) as ctx:
+            snapshot.build_menu()
+
+        assert len(ctx.captured_queries) == 1
+
+    def test_menu_served_from_snapshot(self, api_client, menu):
+        """Once built, the menu costs only the version lookup"""
+        api_client.get('/api/menu')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get('/api/menu')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(ctx.captured_queries) == 1
+        assert 'catalogversion' in ctx.captured_queries[0]['sql']
+        assert response['ETag']
+
+    def test_catalog_change_rebuilds_menu(self, api_client, menu):
+        """A new item appears after the catalog version changes"""
+        mains, _ = menu
+        api_client.get('/api/menu')
+
+        MenuItem.objects.create(name='Lasagne', price=15.00, category=mains)
+        response = api_client.get('/api/menu')
+
+        assert 'Lasagne' in [i['name'] for i in response.data['categories'][0]['menu_items']]
+
+    def test_writes_leave_the_rebuild_to_the_next_read(self, api_client, menu):
+        """Saving rows doesn't render the menu in the writer's request; the next read rebuilds once"""
+        api_client.get('/api/menu')
+        mains, _ = menu
+
+        with mock.patch.object(snapshot, 'build_snapshot', wraps=snapshot.build_snapshot) as build:
+            MenuItem.objects.create(name='Lasagne', price=15.00, category=mains)
+            MenuItem.objects.create(name='Gnocchi', price=11.00, category=mains)
+            assert build.call_count == 0
+
+            response = api_client.get('/api/menu')
+            api_client.get('/api/menu')
+
+        assert build.call_count == 1
+        assert 'Gnocchi' in [i['name'] for i in response.data['categories'][0]['menu_items']]
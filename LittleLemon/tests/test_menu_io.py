@@ -0,0 +1,134 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from LittleLemonAPI.menu_io import import_menu
+from LittleLemonAPI.models import MenuItem, Category
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+CSV = (
+    'category_slug,category_title,name,price,featured\n'
+    'mains,Mains,Pasta,12.50,true\n'
+    'mains,Mains,Pizza,10,false\n'
+    'drinks,Drinks,,,\n'
+)
+
+
+@pytest.mark.django_db
+class TestImportMenu:
+    """Tests for the import_menu command"""
+
+    def test_imports_csv(self, tmp_path):
+        """Categories and items are created from a CSV file"""
+        out = io.StringIO()
+        call_command('import_menu', write(tmp_path, 'menu.csv', CSV), stdout=out)
+
+        pasta = MenuItem.objects.get(name='Pasta')
+        assert pasta.price == Decimal('12.50') and pasta.featured
+        assert pasta.category.slug == 'mains'
+        assert Category.objects.filter(slug='drinks', title='Drinks').exists()
+        assert 'Imported 3 rows' in out.getvalue() and 'rows/s' in out.getvalue()
+
+    def test_upserts_by_slug_and_name(self, tmp_path, test_category, menu_item):
+        """Existing rows are matched by Category.slug and MenuItem.name and updated"""
+        path = write(tmp_path, 'menu.ndjson', json.dumps({
+            'category_slug': test_category.slug, 'category_title': 'Renamed',
+            'name': menu_item.name, 'price': '99.00', 'featured': True,
+        }) + '\n')
+
+        call_command('import_menu', path, stdout=io.StringIO())
+
+        menu_item.refresh_from_db()
+        test_category.refresh_from_db()
+        assert menu_item.price == Decimal('99.00') and menu_item.featured
+        assert menu_item.category_id == test_category.id
+        assert test_category.title == 'Renamed'
+        assert MenuItem.objects.count() == 1
+
+    def test_dry_run_prints_diff_without_writing(self, tmp_path, menu_item):
+        """--dry-run lists the changes and rolls them back"""
+        path = write(tmp_path, 'menu.csv', (
+            'category_slug,category_title,name,price,featured\n'
+            f',,{menu_item.name},1.00,false\n'
+            ',,Brand new,2.00,false\n'
+        ))
+        out = io.StringIO()
+
+        call_command('import_menu', path, '--dry-run', stdout=out)
+
+        output = out.getvalue()
+        assert f'~ item {menu_item.name}: price' in output
+        assert '+ item Brand new' in output
+        assert 'Would import 2 rows' in output
+        assert not MenuItem.objects.filter(name='Brand new').exists()
+
+    def test_bad_rows_are_reported_and_skipped(self, tmp_path):
+        """Invalid rows are rejected with their line number; the rest is imported"""
+        path = write(tmp_path, 'menu.csv', (
+            'category_slug,category_title,name,price,featured\n'
+            ',,Good,1.00,false\n'
+            ',,Bad,abc,false\n'
+        ))
+        err = io.StringIO()
+
+        call_command('import_menu', path, stdout=io.StringIO(), stderr=err)
+
+        assert 'line 3: price is not a number' in err.getvalue()
+        assert list(MenuItem.objects.values_list('name', flat=True)) == ['Good']
+
+    def test_queries_per_batch_not_per_row(self, tmp_path):
+        """A batch costs a fixed number of queries regardless of its size"""
+        def run(count):
+            rows = ''.join(f'cat{count}-{i % 3},Cat {i % 3},Item {count}-{i},1.00,false\n' for i in range(count))
+            with open(write(tmp_path, 'menu.csv', 'category_slug,category_title,name,price,featured\n' + rows)) as file:
+                with CaptureQueriesContext(connection) as ctx:
+                    import_menu(file)
+            return len(ctx.captured_queries)
+
+        assert run(10) == run(200)
+
+    def test_round_trip(self, tmp_path, multiple_menu_items):
+        """export_menu output imports back without changes"""
+        path = str(tmp_path / 'menu.csv')
+        call_command('export_menu', path)
+        out = io.StringIO()
+
+        call_command('import_menu', path, stdout=out)
+
+        assert f'0 items created, 0 updated, {len(multiple_menu_items)} unchanged' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestExportMenu:
+    """Tests for the export_menu command"""
+
+    def test_exports_ndjson(self, tmp_path, menu_item):
+        """Each item is one JSON line"""
+        path = str(tmp_path / 'menu.ndjson')
+
+        call_command('export_menu', path)
+
+        rows = [json.loads(line) for line in open(path)]
+        menu_item.refresh_from_db()
+        assert rows[0]['name'] == menu_item.name
+        assert rows[0]['price'] == str(menu_item.price)
+
+    def test_exports_csv_to_stdout(self, menu_item):
+        """Without a path the CSV goes to stdout"""
+        out = io.StringIO()
+
+        call_command('export_menu', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        assert lines[0] == 'category_slug,category_title,name,price,featured'
+        assert menu_item.name in lines[1]
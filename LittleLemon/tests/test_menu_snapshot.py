@@ -0,0 +1,96 @@
+import os
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from LittleLemonAPI import snapshot
+from LittleLemonAPI.models import Category, MenuItem
+
+
+@pytest.mark.django_db
+class TestMenuSnapshot:
+    """Test suite for list pages served from the memory-mapped snapshot"""
+
+    def regular(self, api_client, url):
+        with mock.patch.object(snapshot, 'render_page', return_value=None):
+            return api_client.get(url)
+
+    def test_snapshot_pages_match_regular_list(self, api_client):
+        """Snapshot pages are byte-identical to the regular list responses"""
+        for i in range(23):
+            MenuItem.objects.create(name=f"Item {i} – zażółć", price=10.00 + i)
+
+        for url in ('/api/menu-items', '/api/menu-items?page=2', '/api/menu-items?page=3'):
+            served = api_client.get(url)
+            assert isinstance(served, snapshot.SnapshotResponse)
+            assert served.content == self.regular(api_client, url).content
+
+    def test_categories_are_served_from_snapshot(self, api_client):
+        """GET /api/categories is served from the snapshot too"""
+        Category.objects.create(slug='mains', title='Mains')
+
+        served = api_client.get('/api/categories')
+
+        assert isinstance(served, snapshot.SnapshotResponse)
+        assert served.content == self.regular(api_client, '/api/categories').content
+
+    def test_warm_snapshot_needs_no_queries(self, api_client, multiple_menu_items):
+        """Once built, unfiltered pages cost only the version lookup"""
+        api_client.get('/api/menu-items')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get('/api/menu-items')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(ctx.captured_queries) == 1
+        assert 'catalogversion' in ctx.captured_queries[0]['sql']
+
+    def test_catalog_change_rebuilds_snapshot(self, api_client, settings, menu_item):
+        """A catalog change makes the next request write a new file"""
+        api_client.get('/api/menu-items')
+        inode = os.stat(settings.MENU_SNAPSHOT_PATH).st_ino
+
+        MenuItem.objects.create(name='Soup', price=4.00)
+        response = api_client.get('/api/menu-items')
+
+        assert response.data['count'] == 2
+        assert os.stat(settings.MENU_SNAPSHOT_PATH).st_ino != inode
+
+    def test_workers_share_one_snapshot(self, api_client, settings, multiple_menu_items):
+        """Workers with separate caches and mappings don't rebuild the file for each other"""
+        def as_worker(name):
+            settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': name}}
+            snapshot.reset()
+            return api_client.get('/api/menu-items')
+
+        with mock.patch.object(snapshot, 'build_snapshot', wraps=snapshot.build_snapshot) as build:
+            as_worker('worker-a')
+            inode = os.stat(settings.MENU_SNAPSHOT_PATH).st_ino
+            for name in ('worker-b', 'worker-a', 'worker-b'):
+                response = as_worker(name)
+                assert isinstance(response, snapshot.SnapshotResponse)
+
+        assert build.call_count == 1
+        assert os.stat(settings.MENU_SNAPSHOT_PATH).st_ino == inode
+
+    def test_filtered_requests_skip_snapshot(self, api_client, multiple_menu_items):
+        """Filters, ordering and other renderers use the regular list"""
+        filtered = api_client.get('/api/menu-items?ordering=price')
+        xml = api_client.get('/api/menu-items', HTTP_ACCEPT='application/xml')
+
+        assert not isinstance(filtered, snapshot.SnapshotResponse)
+        assert not isinstance(xml, snapshot.SnapshotResponse)
+
+    def test_out_of_range_page_returns_404(self, api_client, multiple_menu_items):
+        """Pages past the end still return 404"""
+        response = api_client.get('/api/menu-items?page=5')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_empty_catalog(self, api_client):
+        """An empty menu is served as an empty first page"""
+        response = api_client.get('/api/menu-items')
+
+        assert response.data == {'count': 0, 'next': None, 'previous': None, 'results': []}
@@ -390,3 +390,108 @@ class TestOrdersUnauthenticated:
         response = api_client.delete(f'/api/orders/{customer_order.id}')
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestOrdersBulkStatus:
+    """Tests for PATCH /api/orders/status"""
+
+    def test_delivery_can_bulk_update_own_orders(self, api_client, delivery_user, customer_user, create_order):
+        """Delivery crew marks several assigned orders delivered in one request"""
+        orders = [create_order(user=customer_user, delivery_crew=delivery_user) for _ in range(3)]
+        token = Token.objects.create(user=delivery_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.patch('/api/orders/status', {
+            'orders': [order.id for order in orders],
+            'status': True
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r['result'] for r in response.data['results']] == ['updated'] * 3
+        assert Order.objects.filter(status=True).count() == 3
+
+    def test_delivery_cannot_bulk_update_other_orders(self, api_client, delivery_user, customer_user, create_user, create_order):
+        """Orders assigned to someone else are reported as not_found and left alone"""
+        other_delivery = create_user(username='otherdelivery', groups=['delivery'])
+        own = create_order(user=customer_user, delivery_crew=delivery_user)
+        other = create_order(user=customer_user, delivery_crew=other_delivery)
+        token = Token.objects.create(user=delivery_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.patch('/api/orders/status', {
+            'orders': [own.id, other.id, 999999],
+            'status': True
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [
+            {'id': own.id, 'result': 'updated'},
+            {'id': other.id, 'result': 'not_found'},
+            {'id': 999999, 'result': 'not_found'},
+        ]
+        other.refresh_from_db()
+        assert other.status == False
+
+    def test_delivery_cannot_bulk_update_other_fields(self, api_client, delivery_user, delivery_order):
+        """Delivery crew can only send orders and status"""
+        token = Token.objects.create(user=delivery_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.patch('/api/orders/status', {
+            'orders': [delivery_order.id],
+            'status': True,
+            'total': 1
+        }, format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bulk_update_validates_payload(self, api_client, delivery_user, delivery_order):
+        """Invalid status or order lists are rejected with 400"""
+        token = Token.objects.create(user=delivery_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        bad_status = api_client.patch('/api/orders/status', {
+            'orders': [delivery_order.id], 'status': 'yes'
+        }, format='json')
+        bad_orders = api_client.patch('/api/orders/status', {
+            'orders': 'all', 'status': True
+        }, format='json')
+
+        assert bad_status.status_code == status.HTTP_400_BAD_REQUEST
+        assert bad_orders.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_update_rejects_non_object_body(self, api_client, delivery_user, delivery_order):
+        """A list or scalar body is rejected with 400"""
+        token = Token.objects.create(user=delivery_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        as_list = api_client.patch('/api/orders/status', [delivery_order.id], format='json')
+        as_scalar = api_client.patch('/api/orders/status', 1, format='json')
+
+        assert as_list.status_code == status.HTTP_400_BAD_REQUEST
+        assert as_scalar.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_customer_cannot_bulk_update(self, api_client, customer_user, customer_order):
+        """Customers get 403"""
+        token = Token.objects.create(user=customer_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.patch('/api/orders/status', {
+            'orders': [customer_order.id], 'status': True
+        }, format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_manager_can_bulk_update_any_order(self, api_client, manager_user, customer_order):
+        """Managers may update any order's status"""
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.patch('/api/orders/status', {
+            'orders': [customer_order.id], 'status': 1
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        customer_order.refresh_from_db()
+        assert customer_order.status == True
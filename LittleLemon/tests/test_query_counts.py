@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.models import Order, Cart, MenuItem
+from LittleLemonAPI.optimizers import optimize_queryset
+from LittleLemonAPI.serializers import OrderSerializer, CartSerializer, MenuItemSerializer
+
+
+def count_queries(api_client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestQuerysetOptimizer:
+    """Tests for serializer-driven select_related/prefetch_related"""
+
+    def test_order_serializer_prefetches_order_items(self):
+        """OrderSerializer needs its nested order_items prefetched"""
+        queryset = optimize_queryset(Order.objects.all(), OrderSerializer)
+
+        assert [p.prefetch_to for p in queryset._prefetch_related_lookups] == ['order_items']
+
+    def test_flat_serializers_add_nothing(self):
+        """Primary key relations are read from <fk>_id, so no join is added"""
+        cart = optimize_queryset(Cart.objects.all(), CartSerializer)
+        menu = optimize_queryset(MenuItem.objects.all(), MenuItemSerializer)
+
+        assert not cart.query.select_related and not cart._prefetch_related_lookups
+        assert not menu.query.select_related and not menu._prefetch_related_lookups
+
+    def test_order_list_query_count_is_constant(self, api_client, manager_user, customer_user, create_order, create_order_item, multiple_menu_items):
+        """GET /api/orders costs the same number of queries for 2 or 10 orders"""
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        def add_orders(n):
+            for _ in range(n):
+                order = create_order(user=customer_user)
+                for menu_item in multiple_menu_items:
+                    create_order_item(order=order, menuitem=menu_item)
+
+        add_orders(2)
+        api_client.get('/api/orders')  # warm the role cache
+        small = count_queries(api_client, '/api/orders')
+        add_orders(8)
+        large = count_queries(api_client, '/api/orders')
+
+        assert large == small
+
+    def test_cart_list_query_count_is_constant(self, api_client, customer_user, create_menu_item, create_cart_item):
+        """GET /api/cart/menu-items costs the same number of queries for 1 or 10 rows"""
+        token = Token.objects.create(user=customer_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        create_cart_item(user=customer_user, menuitem=create_menu_item(name='Item 0'))
+        api_client.get('/api/cart/menu-items')  # warm the role cache
+        small = count_queries(api_client, '/api/cart/menu-items')
+        for i in range(1, 10):
+            create_cart_item(user=customer_user, menuitem=create_menu_item(name=f'Item {i}'))
+        large = count_queries(api_client, '/api/cart/menu-items')
+
+        assert large == small
@@ -0,0 +1,73 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from LittleLemonAPI.roles import user_roles
+
+
+def group_queries(ctx):
+    return [q for q in ctx.captured_queries if 'auth_group' in q['sql'] or 'auth_user_groups' in q['sql']]
+
+
+@pytest.mark.django_db
+class TestRoleCache:
+    """Tests for request-scoped and cross-request role resolution"""
+
+    def test_user_roles_are_cached_across_calls(self, manager_user):
+        """The group set is loaded once and then served from the cache"""
+        user_roles(manager_user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            roles = user_roles(manager_user)
+
+        assert 'managers' in roles
+        assert len(ctx.captured_queries) == 0
+
+    def test_adding_group_invalidates_cache(self, customer_user):
+        """user.groups.add() is visible immediately"""
+        assert 'managers' not in user_roles(customer_user)
+
+        customer_user.groups.add(Group.objects.get(name='managers'))
+
+        assert 'managers' in user_roles(customer_user)
+
+    def test_reverse_changes_invalidate_cache(self, manager_user):
+        """group.user_set.remove() and clear() are visible immediately"""
+        managers = Group.objects.get(name='managers')
+        assert 'managers' in user_roles(manager_user)
+        managers.user_set.remove(manager_user)
+        assert 'managers' not in user_roles(manager_user)
+
+        managers.user_set.add(manager_user)
+        assert 'managers' in user_roles(manager_user)
+        managers.user_set.clear()
+        assert 'managers' not in user_roles(manager_user)
+
+    def test_patch_order_runs_no_group_queries_on_warm_cache(self, api_client, manager_user, customer_order):
+        """PATCH /api/orders/{id} resolves roles without touching the group tables"""
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        api_client.get('/api/orders')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.patch(f'/api/orders/{customer_order.id}', {'status': True}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert group_queries(ctx) == []
+
+    def test_group_management_takes_effect_immediately(self, api_client, manager_user, create_user):
+        """A manager removed through the API loses access on the next request"""
+        other_manager = create_user(username='othermanager', groups=['managers'])
+        token = Token.objects.create(user=other_manager)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        assert api_client.get('/api/groups/manager/users').status_code == status.HTTP_200_OK
+
+        api_client.force_authenticate(user=manager_user)
+        api_client.delete(f'/api/groups/manager/users/{other_manager.id}')
+        api_client.force_authenticate(user=None)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.get('/api/groups/manager/users')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
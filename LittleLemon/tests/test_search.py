@@ -0,0 +1,93 @@
+import pytest
+from rest_framework import status
+from LittleLemonAPI.models import Category, MenuItem
+from LittleLemonAPI.search import edit_distance, search
+
+
+def names(response):
+    return [item['name'] for item in response.data['results']]
+
+
+@pytest.mark.django_db
+class TestMenuItemSearch:
+    """Test suite for full-text search on /api/menu-items"""
+
+    @pytest.fixture
+    def catalog(self, db):
+        pizza = Category.objects.create(slug='pizza', title='Pizza')
+        desserts = Category.objects.create(slug='desserts', title='Desserts')
+        MenuItem.objects.create(name='Pizza Margherita', price=15.99, category=pizza)
+        MenuItem.objects.create(name='Pepperoni', price=17.99, category=pizza)
+        MenuItem.objects.create(name='Tiramisu', price=6.99, category=desserts)
+        MenuItem.objects.create(name='Crème brûlée', price=7.50, category=desserts)
+        return pizza, desserts
+
+    def test_search_by_name(self, api_client, catalog):
+        """?search= matches words in item names"""
+        response = api_client.get('/api/menu-items?search=tiramisu')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert names(response) == ['Tiramisu']
+
+    def test_search_by_category_title(self, api_client, catalog):
+        """?search= also matches the category title, ranking name hits first"""
+        response = api_client.get('/api/menu-items?search=pizza')
+
+        assert names(response) == ['Pizza Margherita', 'Pepperoni']
+
+    def test_prefix_search(self, api_client, catalog):
+        """Partial words match as prefixes"""
+        response = api_client.get('/api/menu-items?search=marg')
+
+        assert names(response) == ['Pizza Margherita']
+
+    def test_typo_tolerant_search(self, api_client, catalog):
+        """A word with a typo still matches"""
+        response = api_client.get('/api/menu-items?search=tiramsiu')
+
+        assert names(response) == ['Tiramisu']
+
+    def test_diacritics_are_ignored(self, api_client, catalog):
+        """Searching without accents finds accented names"""
+        response = api_client.get('/api/menu-items?search=creme brulee')
+
+        assert names(response) == ['Crème brûlée']
+
+    def test_all_words_must_match(self, api_client, catalog):
+        """Multi-word searches require every word"""
+        response = api_client.get('/api/menu-items?search=pizza tiramisu')
+
+        assert names(response) == []
+
+    def test_index_follows_renames_and_deletes(self, api_client, catalog):
+        """Signals keep the index in sync with item and category changes"""
+        pizza, desserts = catalog
+        MenuItem.objects.filter(name='Pepperoni').get().delete()
+        desserts.title = 'Sweets'
+        desserts.save()
+
+        assert names(api_client.get('/api/menu-items?search=pepperoni')) == []
+        assert names(api_client.get('/api/menu-items?search=sweets')) == ['Tiramisu', 'Crème brûlée']
+
+    def test_search_combines_with_ordering_and_filters(self, api_client, catalog):
+        """Explicit ordering and filters still apply to search results"""
+        pizza, _ = catalog
+
+        response = api_client.get(f'/api/menu-items?search=pizza&ordering=-price&category={pizza.id}')
+
+        assert names(response) == ['Pepperoni', 'Pizza Margherita']
+        assert response.data['count'] == 2
+
+    def test_search_uses_fts_index(self, catalog):
+        """Search queries go through the FTS5 virtual table"""
+        sql = str(search(MenuItem.objects.all(), 'pizza').query)
+
+        assert 'JOIN "menuitem_fts"' in sql
+        assert '"menuitem_fts"."menuitem_fts" MATCH' in sql
+        assert 'bm25("menuitem_fts"."menuitem_fts"' in sql
+
+    def test_edit_distance(self):
+        """Transpositions, insertions and substitutions count as one edit"""
+        assert edit_distance('tiramisu', 'tiramsiu', 2) == 1
+        assert edit_distance('pizza', 'piza', 1) == 1
+        assert edit_distance('pizza', 'pasta', 1) == 2
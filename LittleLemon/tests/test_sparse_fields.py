@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+
+def count_queries(api_client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        api_client.get(url)
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Tests for ?fields= and ?omit= on list and detail endpoints"""
+
+    def test_fields_limits_menu_item_keys(self, api_client, menu_item):
+        """?fields= keeps only the listed fields"""
+        response = api_client.get('/api/menu-items?fields=id,name')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [{'id': menu_item.id, 'name': menu_item.name}]
+
+    def test_omit_drops_category_keys(self, api_client, test_category):
+        """?omit= removes the listed fields"""
+        response = api_client.get(f'/api/categories/{test_category.id}?omit=slug')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'id': test_category.id, 'title': test_category.title}
+
+    def test_unknown_fields_are_ignored(self, api_client, menu_item):
+        """Names the serializer does not have are skipped"""
+        response = api_client.get('/api/menu-items?fields=id,nope')
+
+        assert response.data['results'] == [{'id': menu_item.id}]
+
+    def test_cart_supports_fields(self, api_client, customer_user, menu_item, create_cart_item):
+        """The cart list honours ?fields="""
+        token = Token.objects.create(user=customer_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        item = create_cart_item(user=customer_user, menuitem=menu_item)
+
+        response = api_client.get('/api/cart/menu-items?fields=menuitem,quantity')
+
+        assert response.data == [{'menuitem': item.menuitem_id, 'quantity': item.quantity}]
+
+    def test_writes_ignore_fields(self, api_client, manager_user):
+        """POST still validates and returns the full field set"""
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        response = api_client.post('/api/categories?fields=id', {'slug': 'soups', 'title': 'Soups'})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert set(response.data) == {'id', 'slug', 'title'}
+
+    def test_omitted_order_items_are_not_prefetched(self, api_client, manager_user, customer_user, create_order, create_order_item, menu_item):
+        """Dropping order_items also drops its prefetch query"""
+        token = Token.objects.create(user=manager_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        order = create_order(user=customer_user)
+        create_order_item(order=order, menuitem=menu_item)
+
+        api_client.get('/api/orders')  # warm the role cache
+        full = count_queries(api_client, '/api/orders')
+        sparse = count_queries(api_client, '/api/orders?fields=id,status,total')
+        response = api_client.get('/api/orders?fields=id,status,total')
+
+        assert sparse == full - 1
+        assert [set(row) for row in response.data['results']] == [{'id', 'status', 'total'}]